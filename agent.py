@@ -1,7 +1,9 @@
 # translation_functions.py
 import boto3
 import json
-from typing import Dict, Any
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, Iterator, List, Optional
 
 # Initialize AWS Bedrock client
 bedrock_runtime = boto3.client(
@@ -308,3 +310,104 @@ def process_document(text_content: str, target_language: str = "French") -> Dict
         "quality_review": quality_result.get("quality_review", {}),
         "target_language": target_language
     }
+
+class TranslationStageError(Exception):
+    """Raised by process_document_stream when a workflow stage fails; stage is named as in process_document"""
+    
+    def __init__(self, stage: str, message: str):
+        super().__init__(message)
+        self.stage = stage
+
+def _chunk_paragraphs(paragraphs: Iterable[str], max_chars: int = 4000) -> Iterator[List[str]]:
+    """Group consecutive paragraphs into chunks of roughly max_chars characters"""
+    chunk = []
+    size = 0
+    for paragraph in paragraphs:
+        if chunk and size + len(paragraph) > max_chars:
+            yield chunk
+            chunk = []
+            size = 0
+        chunk.append(paragraph)
+        size += len(paragraph) + 1
+    if chunk:
+        yield chunk
+
+def _translate_chunk(chunk: List[str], document_analysis: Dict[str, Any], target_language: str) -> Dict[str, Any]:
+    """Run translation, quality check and enhancement on a single chunk of paragraphs"""
+    chunk_text = "\n".join(chunk)
+    
+    # Blank chunks carry layout only, there is nothing to translate
+    if not chunk_text.strip():
+        return {"paragraphs": chunk, "quality_review": {}}
+    
+    # A failed stage raises, so untranslated text is never emitted as a translation
+    translation_result = translate_document(chunk_text, document_analysis, target_language)
+    if "error" in translation_result:
+        raise TranslationStageError("translation", translation_result["error"])
+    
+    quality_result = check_quality(chunk_text, translation_result.get("translated_text", ""), target_language)
+    if "error" in quality_result:
+        raise TranslationStageError("quality_check", quality_result["error"])
+    
+    enhanced_translation = enhance_translation(
+        chunk_text,
+        quality_result.get("translated_text", ""),
+        target_language
+    )
+    
+    return {
+        "paragraphs": enhanced_translation.split("\n"),
+        "quality_review": quality_result.get("quality_review", {})
+    }
+
+def process_document_stream(
+    paragraphs: Iterable[str],
+    target_language: str = "French",
+    max_workers: int = 4,
+    details: Optional[Dict[str, Any]] = None
+) -> Iterator[str]:
+    """Run the translation workflow over paragraph chunks, yielding translated paragraphs in order
+    
+    The first chunk is used for document analysis. At most max_workers chunks are in flight at
+    once, so the whole translated document is never held in memory. If details is given it is
+    filled with the document analysis and the quality review of each chunk. A failed stage raises
+    TranslationStageError; chunks still queued at that point are cancelled.
+    """
+    chunks = _chunk_paragraphs(paragraphs)
+    first_chunk = next(chunks, None)
+    if first_chunk is None:
+        return
+    
+    # Step 1: Document analysis on the leading chunk
+    analysis_result = analyze_document("\n".join(first_chunk))
+    if "error" in analysis_result:
+        raise TranslationStageError("document_analysis", analysis_result["error"])
+    document_analysis = analysis_result.get("document_analysis", {})
+    if details is not None:
+        details["document_analysis"] = document_analysis
+        details["quality_reviews"] = []
+    
+    # Steps 2-4: Translate, check and enhance chunks with bounded concurrency
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque([executor.submit(_translate_chunk, first_chunk, document_analysis, target_language)])
+        
+        try:
+            for chunk in chunks:
+                if len(pending) >= max_workers:
+                    yield from _drain_chunk(pending.popleft(), details)
+                pending.append(executor.submit(_translate_chunk, chunk, document_analysis, target_language))
+            
+            while pending:
+                yield from _drain_chunk(pending.popleft(), details)
+        except BaseException:
+            # Stop queued chunks on a failed stage or an abandoned stream instead of translating them anyway
+            for future in pending:
+                future.cancel()
+            raise
+
+def _drain_chunk(future, details: Optional[Dict[str, Any]]) -> Iterator[str]:
+    """Wait for a chunk translation and yield its paragraphs"""
+    chunk_result = future.result()
+    if details is not None and chunk_result["quality_review"]:
+        details["quality_reviews"].append(chunk_result["quality_review"])
+    yield from chunk_result["paragraphs"]
@@ -1,35 +1,42 @@
 # app.py
 import streamlit as st
-import mammoth
+import mmap
 import os
-import docx
 import tempfile
 import base64
-from io import BytesIO
-from translation_functions import process_document
+import hashlib
+from io import BytesIO, StringIO
+from translation_functions import process_document_stream, TranslationStageError
 
 def extract_text_from_docx(file_path):
     """Extract text from a .docx file"""
+    import mammoth  # deferred so TXT-only sessions never load it
+    
     with open(file_path, "rb") as docx_file:
         result = mammoth.extract_raw_text(docx_file)
         return result.value
 
 def extract_text_from_txt(file_path):
     """Extract text from a .txt file"""
-    with open(file_path, "r", encoding="utf-8") as f:
-        return f.read()
-
-def create_download_link(content, filename, link_text):
-    """Generate a download link for text content"""
-    b64 = base64.b64encode(content.encode()).decode()
-    href = f'<a href="data:file/txt;base64,{b64}" download="{filename}">{link_text}</a>'
-    return href
+    # Decode straight from a read-only mapping rather than reading the file into a buffer first
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = str(mm, "utf-8")
+    
+    # Universal newlines, as text-mode open() gave
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
 
-def save_docx(text, filename):
-    """Save text to a .docx file and create download link"""
+def save_docx(paragraphs, filename):
+    """Save an iterable of paragraphs to a .docx file and create download link"""
+    import docx  # deferred: python-docx pulls in lxml
+    
     # Create a docx file
     doc = docx.Document()
-    for paragraph in text.split('\n'):
+    for paragraph in paragraphs:
         doc.add_paragraph(paragraph)
     
     # Save to BytesIO object
@@ -70,7 +77,7 @@ def main():
     if uploaded_file is not None:
         # Create a temp file
         with tempfile.NamedTemporaryFile(delete=False, suffix="." + uploaded_file.name.split(".")[-1]) as tmp:
-            tmp.write(uploaded_file.getvalue())
+            tmp.write(uploaded_file.getbuffer())
             temp_file_path = tmp.name
         
         # Extract text based on file type
@@ -87,6 +94,10 @@ def main():
         # Remove temp file
         os.unlink(temp_file_path)
         
+        # Stored translations belong to one upload (by content) and target language
+        file_stem = uploaded_file.name.split(".")[0]
+        translation_key = (hashlib.blake2b(uploaded_file.getbuffer(), digest_size=16).hexdigest(), target_language)
+        
         # Display original text
         st.subheader("Original Document")
         with st.expander("Show Original Content", expanded=True):
@@ -117,48 +128,83 @@ def main():
                 st.markdown("✨ Applying contextual enhancements...")
                 progress_bar.progress(90)
                 
-                # Run the full translation process
-                result = process_document(text_content, target_language)
+                # Run the translation over paragraph chunks, writing the DOCX as results arrive
+                paragraphs = (line.rstrip('\n') for line in StringIO(text_content))
+                paragraph_count = text_content.count('\n') + 1
+                details = {}
+                translated_paragraphs = []
                 
-                progress_bar.progress(100)
-                st.success("Translation completed!")
+                def collect_translation(stream):
+                    for paragraph in stream:
+                        translated_paragraphs.append(paragraph)
+                        progress_bar.progress(min(99, 90 + 10 * len(translated_paragraphs) // paragraph_count))
+                        yield paragraph
                 
-                if "error" in result:
-                    st.error(f"Error during {result.get('stage', 'translation')}: {result['error']}")
+                try:
+                    docx_download = save_docx(
+                        collect_translation(process_document_stream(paragraphs, target_language, details=details)),
+                        f"{file_stem}_translated_{target_language}.docx"
+                    )
+                except TranslationStageError as e:
+                    translation = {"error": str(e), "stage": e.stage}
                 else:
-                    # Display translated text
-                    st.text_area("Translated Text", result["translated_text"], height=300)
-                    
-                    # Download options
-                    st.subheader("Download Options")
-                    col1, col2 = st.columns(2)
-                    
-                    # Download as TXT
-                    with col1:
-                        txt_download = create_download_link(
-                            result["translated_text"], 
-                            f"{uploaded_file.name.split('.')[0]}_translated_{target_language}.txt",
-                            "Download as TXT"
-                        )
-                        st.markdown(txt_download, unsafe_allow_html=True)
-                    
-                    # Download as DOCX
-                    with col2:
-                        docx_download = save_docx(
-                            result["translated_text"],
-                            f"{uploaded_file.name.split('.')[0]}_translated_{target_language}.docx"
-                        )
-                        st.markdown(docx_download, unsafe_allow_html=True)
-                    
-                    # Display document analysis if available
-                    if "document_analysis" in result and result["document_analysis"]:
-                        with st.expander("Document Analysis"):
-                            st.json(result["document_analysis"])
-                    
-                    # Display quality review if available
-                    if "quality_review" in result and result["quality_review"]:
-                        with st.expander("Translation Quality Assessment"):
-                            st.json(result["quality_review"])
+                    translated_text = "\n".join(translated_paragraphs)
+                    if not translated_text.strip():
+                        # Nothing came back, so there is nothing to show or download
+                        translation = {"error": "No text content provided", "stage": "translation"}
+                    else:
+                        translation = {
+                            "translated_text": translated_text,
+                            "txt": translated_text.encode("utf-8"),
+                            "docx_link": docx_download,
+                            "details": details
+                        }
+                        progress_bar.progress(100)
+                        st.success("Translation completed!")
+            
+            # Keep the result for reruns, so a download click does not drop it or force a new Bedrock run
+            st.session_state.translation = translation
+            st.session_state.translation_key = translation_key
+        
+        # Results render outside the button branch, for the upload and language they were made from
+        translation = st.session_state.get("translation")
+        if translation is None or st.session_state.get("translation_key") != translation_key:
+            return
+        
+        if "error" in translation:
+            st.error(f"Error during {translation['stage']}: {translation['error']}")
+        else:
+            # Display translated text
+            st.text_area("Translated Text", translation["translated_text"], height=300)
+            
+            # Download options
+            st.subheader("Download Options")
+            col1, col2 = st.columns(2)
+            
+            # Download as TXT, encoded once per translation and sent as raw bytes
+            with col1:
+                st.download_button(
+                    "Download as TXT",
+                    data=translation["txt"],
+                    file_name=f"{file_stem}_translated_{target_language}.txt",
+                    mime="text/plain"
+                )
+            
+            # Download as DOCX
+            with col2:
+                st.markdown(translation["docx_link"], unsafe_allow_html=True)
+            
+            details = translation["details"]
+            
+            # Display document analysis if available
+            if details.get("document_analysis"):
+                with st.expander("Document Analysis"):
+                    st.json(details["document_analysis"])
+            
+            # Display quality review of each chunk if available
+            if details.get("quality_reviews"):
+                with st.expander("Translation Quality Assessment"):
+                    st.json(details["quality_reviews"])
 
 if __name__ == "__main__":
     main()
@@ -3,20 +3,43 @@ import sys
 import argparse
 import json
 import re
+import mmap
+import importlib.util
 import anthropic
+import httpx
 from pathlib import Path
 
+# HTTP/2 in httpx needs the optional h2 package; fall back to HTTP/1.1 keep-alive without it
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 class MainframeCodeDocumenter:
     """A tool to generate comprehensive technical documentation from mainframe code using Claude 3.5 Sonnet."""
     
-    def __init__(self, api_key=None, model="claude-3-5-sonnet-20240620"):
+    # Content heuristics fused into one pattern so detection is a single scan of the prefix
+    _DETECT_RE = re.compile(
+        r'(?P<jcl>^\s*//\s*EXEC\s+)'
+        r'|(?P<cobol>^\s*IDENTIFICATION\s+DIVISION)'
+        r'|(?P<proc>^\s*PROC\s+\d+\s)'
+        r'|(?P<asm>^\s*CSECT\s+)',
+        re.MULTILINE
+    )
+    _DETECT_LANGUAGES = {"jcl": "JCL", "cobol": "COBOL", "proc": "PROC", "asm": "Assembler"}
+    
+    def __init__(self, api_key=None, model="claude-3-5-sonnet-20240620", max_connections=32):
         """Initialize the documenter with API credentials and parameters."""
         self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
         if not self.api_key:
             raise ValueError("Anthropic API key is required. Set the ANTHROPIC_API_KEY environment variable or pass it as a parameter.")
         
         self.model = model
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        
+        # Shared connection pool so batch runs reuse persistent TLS sessions across calls
+        self.http_client = httpx.Client(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(600.0, connect=10.0)
+        )
+        self.client = anthropic.Anthropic(api_key=self.api_key, http_client=self.http_client)
         
         # Dictionary mapping file extensions to mainframe languages
         self.extension_map = {
@@ -29,7 +52,7 @@ class MainframeCodeDocumenter:
             # Add more mappings as needed
         }
         
-    def detect_language(self, filename):
+    def detect_language(self, filename, content=None):
         """Detect the mainframe language based on file extension or content analysis."""
         ext = Path(filename).suffix.lower()
         
@@ -38,18 +61,14 @@ class MainframeCodeDocumenter:
             return self.extension_map[ext]
             
         # Attempt content-based detection if extension is unknown
-        with open(filename, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read(1000)  # Read first 1000 characters for analysis
-            
-            # Simple heuristics for language detection
-            if re.search(r'^\s*//\s*EXEC\s+', content, re.MULTILINE):
-                return "JCL"
-            elif re.search(r'^\s*IDENTIFICATION\s+DIVISION', content, re.MULTILINE):
-                return "COBOL"
-            elif re.search(r'^\s*PROC\s+\d+\s', content, re.MULTILINE):
-                return "PROC"
-            elif re.search(r'^\s*CSECT\s+', content, re.MULTILINE):
-                return "Assembler"
+        if content is None:
+            with open(filename, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read(1000)  # Read first 1000 characters for analysis
+        
+        # Simple heuristics for language detection
+        match = self._DETECT_RE.search(content)
+        if match:
+            return self._DETECT_LANGUAGES[match.lastgroup]
             
         # Default to generic if detection fails
         return "Unknown Mainframe Code"
@@ -112,10 +131,16 @@ Format the document with clear headings, bullet points for lists, and tables for
     def generate_documentation(self, filename):
         """Generate technical documentation from the provided file."""
         try:
-            with open(filename, 'r', encoding='utf-8', errors='ignore') as f:
-                code = f.read()
+            # Map the file instead of slurping it; only the detection prefix is decoded up front
+            with open(filename, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    prefix = code = ""
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        prefix = mm[:1000].decode('utf-8', errors='ignore')
+                        code = str(mm, 'utf-8', 'ignore')  # decode straight from the mapping, no bytes copy
             
-            language = self.detect_language(filename)
+            language = self.detect_language(filename, prefix)
             print(f"Detected language: {language}")
             
             prompt = self.create_prompt(code, language)
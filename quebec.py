@@ -1,11 +1,23 @@
 import os
 import json
+import re
+import functools
+import hashlib
+import shelve
+import threading
 import boto3
-from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from botocore.config import Config
+from botocore.exceptions import ClientError, ParamValidationError
 import urllib3
-from typing import Dict, Any, Optional, Union
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
 import warnings
 
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib json module
+    orjson = None
+
 # Configure warnings and disable insecure request warnings
 warnings.filterwarnings("ignore", category=UserWarning, message="Unverified HTTPS request")
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -13,8 +25,122 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 # Model configuration
 MODEL_ID = "anthropic.claude-3-5-sonnet-20240620-v1:0"  # Claude 3.5 Sonnet model ID
 
+# Client configuration shared by every call; the connection pool is reused across threads
+BEDROCK_CONFIG = Config(
+    retries={"max_attempts": 6, "mode": "adaptive"},
+    connect_timeout=5,
+    read_timeout=300,
+    max_pool_connections=64,
+    tcp_keepalive=True
+)
+
+# Inference latency mode; claude-3-5-sonnet-20240620 is not offered with "optimized", so standard is the default
+BEDROCK_LATENCY = os.getenv("BEDROCK_LATENCY", "standard")
+
+# Latency modes Bedrock (or the installed botocore) has rejected once; later calls go straight to standard
+_UNSUPPORTED_LATENCIES = set()
+
+def _dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize an object to UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    # Keep accented characters as UTF-8 rather than six-byte \u escapes
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+def _loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON bytes or text, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Reusable decoder for pulling JSON objects out of model responses
+_JSON_DECODER = json.JSONDecoder()
+
+# Fields that are identical in every Bedrock request
+_BASE_PAYLOAD = {"anthropic_version": "bedrock-2023-05-31"}
+
+# Prompt-cache marker for stable prefixes (system prompts, glossary)
+CACHE_CONTROL = {"type": "ephemeral"}
+# Bedrock prompt caching, by model name: the fewest tokens a cached prefix may hold. Other models reject
+# cache_control, and shorter prefixes are never cached, so blocks are only marked when both allow it
+PROMPT_CACHE_MIN_TOKENS = {
+    "claude-3-5-haiku-20241022-v1:0": 2048,
+    "claude-3-7-sonnet-20250219-v1:0": 1024,
+    "claude-sonnet-4-20250514-v1:0": 1024,
+    "claude-opus-4-20250514-v1:0": 1024,
+}
+
+# System prompts shared by every document; keeping them static makes them reusable prompt-cache prefixes
+TRANSLATION_SYSTEM_PROMPT = """You are an expert Quebec French translator. You are translating for a Quebec audience 
+and must use Quebec French vocabulary, expressions, and grammar patterns. Translate accurately while preserving the 
+original formatting, tone, and style.
+
+Important Quebec French translation guidelines:
+1. Use Quebec French terminology and expressions rather than International French
+2. Apply Quebec grammar conventions (including contractions like "y'a" instead of "il y a" in informal contexts)
+3. Use Quebec idioms and colloquialisms where appropriate for the context
+4. Adapt cultural references for a Quebec audience
+5. For technical content, use terms familiar to Quebec professionals in that field
+6. Preserve the original formatting, paragraph structure, and style
+7. For informal content, consider using appropriate joual expressions if the context allows it"""
+
+QUALITY_REVIEW_SYSTEM_PROMPT = """You are an expert Quebec French reviewer with deep knowledge of Quebec language and culture. 
+Your task is to review translations for accuracy, fluency, and whether they properly reflect Quebec French 
+rather than International French. You should identify any terms or expressions that sound like International 
+French and provide Quebec alternatives."""
+
+ENHANCEMENT_SYSTEM_PROMPT = """You are an expert in Quebec French localization and cultural adaptation. Your task is to 
+enhance translations to make them culturally authentic and linguistically appropriate for a Quebec audience.
+You understand the nuances between International French vs. Quebec French, including vocabulary differences, 
+grammar patterns, expressions, and cultural references."""
+
+# Review checklist shared by the full-text and sampled review prompts
+REVIEW_CRITERIA = """Please provide:
+1. Overall quality assessment (1-10)
+2. Quebec French authenticity (1-10, where 10 means perfectly Quebec French)
+3. Accuracy assessment (1-10)
+4. Fluency assessment (1-10)
+5. Style preservation assessment (1-10)
+6. International French terms that should be replaced with Quebec equivalents
+7. Cultural adaptations assessment
+8. Suggested corrections to make the text more authentically Quebec French
+
+Respond in JSON format."""
+
+# Persistent cache of finished translations, keyed by a hash of the input text and pipeline settings
+TRANSLATION_CACHE_PATH = os.getenv(
+    "QUEBEC_TRANSLATION_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "quebec_translations")
+)
+_CACHE_LOCK = threading.Lock()
+
+# Output token budgeting: Latin-script text averages roughly 3.5 characters per token, and
+# English to Quebec French translations run up to ~1.3x longer, so 1.6x leaves headroom
+CHARS_PER_TOKEN = 3.5
+TRANSLATION_LENGTH_RATIO = 1.6
+MAX_OUTPUT_TOKENS = 4096  # claude-3-5-sonnet-20240620 output limit on Bedrock; larger budgets are rejected
+
+# Target size of the paragraph-aligned chunks long documents are translated in
+TRANSLATION_CHUNK_CHARS = 2000
+# Boundaries text is cut at, coarsest first: paragraphs always, lines and then sentences only for pieces over the target
+CHUNK_BOUNDARY_RES = (re.compile(r"(\n\n)"), re.compile(r"(\n)"), re.compile(r"(?<=[.!?])(\s+)"))
+
+# Progress callbacks receive (percent_complete, message); chunk translation reports within this range
+ProgressCallback = Callable[[int, str], None]
+TRANSLATION_PROGRESS_START = 30
+TRANSLATION_PROGRESS_END = 80
+
+# Process-wide glossary, set once a generated glossary parses; guarded so concurrent misses make one call
+_GLOSSARY_LOCK = threading.Lock()
+_quebec_glossary: Optional[Dict[str, Any]] = None
+_quebec_glossary_block: Optional[str] = None
+
+# Shared pool for running independent Bedrock calls concurrently (calls are network-bound)
+_EXECUTOR = ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 5)
+
+@functools.lru_cache(maxsize=1)
 def initialize_bedrock_client():
-    """Initialize and return AWS Bedrock client with credentials from environment variables"""
+    """Initialize and return AWS Bedrock client with credentials from environment variables (created once per process)"""
     aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID")
     aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY")
     aws_session_token = os.getenv("AWS_SESSION_TOKEN")
@@ -25,41 +151,111 @@ def initialize_bedrock_client():
         aws_session_token=aws_session_token
     )
 
-    bedrock = session.client(service_name='bedrock-runtime', region_name='us-east-1', verify=False)
+    bedrock = session.client(service_name='bedrock-runtime', region_name='us-east-1', verify=False, config=BEDROCK_CONFIG)
     return bedrock
 
-def invoke_bedrock_claude(
+def _text_block(text: str, prefix_chars: int) -> Dict[str, Any]:
+    """Return a text content block, marked as a cache breakpoint if the model caches prompts and the prompt
+    up to and including this block (prefix_chars long) is big enough to be cached"""
+    block = {"type": "text", "text": text}
+    min_tokens = PROMPT_CACHE_MIN_TOKENS.get(MODEL_ID.rsplit("anthropic.", 1)[-1])
+    if min_tokens is not None and prefix_chars / CHARS_PER_TOKEN >= min_tokens:
+        block["cache_control"] = CACHE_CONTROL
+    return block
+
+def _build_request_body(
     prompt: str, 
-    system: Optional[str] = None, 
-    max_tokens: int = 512, 
-    temperature: float = 0.1
-) -> str:
-    """Invoke Claude model through AWS Bedrock"""
-    bedrock = initialize_bedrock_client()
+    system: Optional[str], 
+    max_tokens: int, 
+    temperature: float,
+    cache_prefix: Optional[str]
+) -> bytes:
+    """Build the serialized Anthropic messages payload for a Bedrock invocation"""
+    # The system prompt precedes the message content, so it counts toward the cached prefix
+    system_chars = len(system) if system else 0
+    content = [{"type": "text", "text": prompt}]
+    if cache_prefix:
+        content.insert(0, _text_block(cache_prefix, system_chars + len(cache_prefix)))
     
     request_payload = {
-        "anthropic_version": "bedrock-2023-05-31",
+        **_BASE_PAYLOAD,
         "max_tokens": max_tokens,
         "temperature": temperature,
         "messages": [
             {
                 "role": "user",
-                "content": [{"text": prompt}]
+                "content": content
             }
         ]
     }
     
     if system:
-        request_payload["system"] = system
+        request_payload["system"] = [_text_block(system, system_chars)]
+    
+    return _dumps(request_payload)
+
+class OutputTruncatedError(Exception):
+    """Raised when a response stopped at max_tokens and the caller needs the complete text"""
+
+def _latency_params(latency: str) -> Dict[str, str]:
+    """Return the invoke_model latency argument; standard sends none, so older botocore releases work too"""
+    if latency == "standard" or latency in _UNSUPPORTED_LATENCIES:
+        return {}
+    return {"performanceConfigLatency": latency}
+
+def _is_latency_unsupported(error: Exception, latency: str) -> bool:
+    """Check whether an error means the requested latency mode is not offered, remembering it if so"""
+    if isinstance(error, ParamValidationError):
+        # botocore older than 1.35.73 does not know the performanceConfigLatency parameter at all
+        unsupported = "performanceConfigLatency" in str(error)
+    else:
+        unsupported = error.response.get("Error", {}).get("Code") == "ValidationException"
+    if unsupported:
+        _UNSUPPORTED_LATENCIES.add(latency)
+    return unsupported
+
+def invoke_bedrock_claude(
+    prompt: str, 
+    system: Optional[str] = None, 
+    max_tokens: int = 512, 
+    temperature: float = 0.1,
+    latency: str = BEDROCK_LATENCY,
+    cache_prefix: Optional[str] = None,
+    require_complete: bool = False
+) -> str:
+    """Invoke Claude model through AWS Bedrock, with the requested latency mode where it is offered
+    
+    The system prompt and the optional cache_prefix (stable text sent ahead of the prompt) are
+    marked as prompt-cache breakpoints, on models that support caching and where the prefix is long
+    enough to be cached, so repeated calls only pay for the changing suffix.
+    With require_complete, a response cut off at max_tokens raises OutputTruncatedError.
+    """
+    bedrock = initialize_bedrock_client()
         
     try:
-        response = bedrock.invoke_model(
-            modelId=MODEL_ID,
-            contentType="application/json",
-            accept="application/json",
-            body=json.dumps(request_payload).encode("utf-8")
-        )
-        response_body = json.loads(response["body"].read().decode("utf-8"))
+        body = _build_request_body(prompt, system, max_tokens, temperature, cache_prefix)
+        latency_params = _latency_params(latency)
+        try:
+            response = bedrock.invoke_model(
+                modelId=MODEL_ID,
+                contentType="application/json",
+                accept="application/json",
+                body=body,
+                **latency_params
+            )
+        except (ClientError, ParamValidationError) as e:
+            # Not every model/region (or botocore release) offers this latency mode; fall back to standard inference
+            if not latency_params or not _is_latency_unsupported(e, latency):
+                raise
+            response = bedrock.invoke_model(
+                modelId=MODEL_ID,
+                contentType="application/json",
+                accept="application/json",
+                body=body
+            )
+        response_body = _loads(response["body"].read())  # parse the raw bytes, no decode copy
+        if require_complete and response_body.get("stop_reason") == "max_tokens":
+            raise OutputTruncatedError(f"Response reached max_tokens={max_tokens}")
         return response_body["content"][0]["text"]
     except ClientError as e:
         print(f"AWS Error: Cannot invoke '{MODEL_ID}'. Reason: {e}")
@@ -70,15 +266,13 @@ def invoke_bedrock_claude(
 
 def extract_json(text: str) -> Dict:
     """Extract JSON from Claude's response"""
+    # Decode in place from the first opening brace; raw_decode stops at the end of the object
+    json_start = text.find('{')
+    if json_start < 0:
+        return {"raw_response": text}
     try:
-        # Look for JSON pattern
-        json_start = text.find('{')
-        json_end = text.rfind('}') + 1
-        if json_start >= 0 and json_end > json_start:
-            json_str = text[json_start:json_end]
-            return json.loads(json_str)
-        else:
-            return {"raw_response": text}
+        json_data, _ = _JSON_DECODER.raw_decode(text, json_start)
+        return json_data
     except json.JSONDecodeError:
         return {"raw_response": text}
 
@@ -115,7 +309,7 @@ Provide the following information in JSON format:
     }
 
 def create_quebec_french_glossary() -> Dict[str, str]:
-    """Create a glossary of common terms specific to Quebec French"""
+    """Create a glossary of common terms specific to Quebec French (one model call; see quebec_french_glossary)"""
     
     system_prompt = """You are a Quebec French language specialist. Your task is to create a comprehensive 
     glossary of terms that differ between International French and Quebec French."""
@@ -137,33 +331,177 @@ def create_quebec_french_glossary() -> Dict[str, str]:
     
     return glossary_data
 
-def translate_document_to_quebec_french(
-    text_content: str, 
-    document_analysis: Dict[str, Any]
-) -> Dict[str, Any]:
-    """Translate document content to Quebec French while preserving formatting and style"""
-    if not text_content:
-        return {"error": "No text content provided"}
-    
-    # Create a specialized system prompt based on document analysis
+def _format_glossary(quebec_glossary: Dict[str, Any]) -> str:
+    """Render the glossary as compact `english → québécois` lines for the translation prompt"""
+    if "raw_response" in quebec_glossary:
+        # The glossary response was not valid JSON; pass the text through as-is
+        return "Quebec French vocabulary guidelines:\n" + str(quebec_glossary["raw_response"])
+    return "Quebec French vocabulary guidelines:\n" + "\n".join(_glossary_lines(quebec_glossary))
+
+def _glossary_lines(glossary: Dict[str, Any], indent: str = "") -> List[str]:
+    """Render glossary entries as lines; nested groups become indented sections and lists comma-separated terms"""
+    lines = []
+    for english, quebec in glossary.items():
+        if isinstance(quebec, dict):
+            lines.append(f"{indent}{english}:")
+            lines.extend(_glossary_lines(quebec, indent + "  "))
+        elif isinstance(quebec, list):
+            lines.append(f"{indent}{english} → {', '.join(str(term) for term in quebec)}")
+        else:
+            lines.append(f"{indent}{english} → {quebec}")
+    return lines
+
+def quebec_french_glossary() -> Dict[str, Any]:
+    """Return the process-wide Quebec French glossary, generating it on first use
+    
+    Concurrent first callers wait on the lock and share one generation. A response that did not
+    parse as JSON is returned but not kept, so the next caller tries again.
+    """
+    global _quebec_glossary
+    with _GLOSSARY_LOCK:
+        if _quebec_glossary is not None:
+            return _quebec_glossary
+        glossary = create_quebec_french_glossary()
+        if "raw_response" not in glossary:
+            _quebec_glossary = glossary
+        return glossary
+
+def quebec_french_glossary_block() -> str:
+    """Return the process-wide glossary formatted for the translation prompt, rendered once the glossary is kept"""
+    global _quebec_glossary_block
+    if _quebec_glossary_block is not None:
+        return _quebec_glossary_block
+    glossary = quebec_french_glossary()
+    block = _format_glossary(glossary)
+    if glossary is _quebec_glossary:  # an unparsed response is not kept, so neither is its block
+        _quebec_glossary_block = block
+    return block
+
+def _score(review_data: Dict[str, Any], key: str) -> int:
+    """Read a 1-10 review score as an int, treating missing or malformed values as 0"""
+    try:
+        return int(review_data.get(key, 0))
+    except (TypeError, ValueError):
+        return 0
+
+class ReviewScores(NamedTuple):
+    """Numeric scores read from a translation review"""
+    overall_quality: int
+    quebec_authenticity: int
+    
+    @classmethod
+    def from_review(cls, review_data: Dict[str, Any]) -> "ReviewScores":
+        """Parse the scores once from a review dict"""
+        return cls(_score(review_data, "overall_quality"), _score(review_data, "quebec_french_authenticity"))
+
+def _is_trivial(text: str) -> bool:
+    """Check whether text has nothing to translate (only whitespace, digits or punctuation)"""
+    return not any(char.isalpha() for char in text)
+
+def _estimated_output_tokens(text: str, extra: int = 0) -> int:
+    """Estimate the output tokens a translation of text needs from its approximate token count"""
+    return int(len(text) / CHARS_PER_TOKEN * TRANSLATION_LENGTH_RATIO) + 128 + extra
+
+def _output_token_budget(text: str, extra: int = 0) -> int:
+    """Estimate max_tokens for a translation of text, capped at the model's output limit"""
+    return min(MAX_OUTPUT_TOKENS, _estimated_output_tokens(text, extra))
+
+def _rewrite_whole_text(prompt: str, system: str, current_text: str) -> str:
+    """Run a whole-text rewrite (correction or enhancement), keeping current_text if the rewrite cannot be complete"""
+    # Too long to come back in one response: skip the call rather than pay for a cut-off rewrite
+    if _estimated_output_tokens(current_text) > MAX_OUTPUT_TOKENS:
+        print("Skipping whole-text rewrite: the text exceeds the model's output limit")
+        return current_text
+    try:
+        return invoke_bedrock_claude(
+            prompt=prompt,
+            system=system,
+            max_tokens=_output_token_budget(current_text),
+            require_complete=True
+        )
+    except OutputTruncatedError as e:
+        print(f"Keeping the previous translation: rewrite was cut off ({e})")
+        return current_text
+
+def _samples(text: str, size: int = 1000) -> Tuple[str, str, str]:
+    """Return the beginning, middle and end samples of a long text used for spot-check reviews"""
+    middle = len(text) // 2
+    return text[:size], text[middle - size // 2:middle + size // 2], text[-size:]
+
+def _split_text(text: str, target: int, level: int = 0) -> List[Tuple[str, str]]:
+    """Cut text into (piece, following separator) pairs at paragraphs, and at finer boundaries for pieces over target"""
+    parts = CHUNK_BOUNDARY_RES[level].split(text)
+    pieces = []
+    for part, separator in zip(parts[::2], parts[1::2] + [""]):
+        if len(part) > target and level + 1 < len(CHUNK_BOUNDARY_RES):
+            sub_pieces = _split_text(part, target, level + 1)
+            sub_pieces[-1] = (sub_pieces[-1][0], separator)
+            pieces.extend(sub_pieces)
+        else:
+            pieces.append((part, separator))
+    return pieces
+
+def _chunk_text(text: str, target: int = TRANSLATION_CHUNK_CHARS) -> List[Tuple[str, str]]:
+    """Greedily pack text into chunks of about target characters, as (chunk, separator that followed it) pairs
+    
+    Chunks break at paragraphs where possible; blank pieces are folded into the separators (leading ones are
+    dropped), so no chunk is empty.
+    """
+    chunks = []
+    current = ""
+    separator = ""
+    for piece, piece_separator in _split_text(text, target):
+        if not piece.strip():
+            separator += piece + piece_separator
+            continue
+        if current and len(current) + len(separator) + len(piece) > target:
+            chunks.append((current, separator))
+            current = piece
+        else:
+            current = current + separator + piece if current else piece
+        separator = piece_separator
+    if current:
+        chunks.append((current, separator))
+    return chunks
+
+def _join_chunks(results: List[str], chunks: List[Tuple[str, str]]) -> str:
+    """Reassemble per-chunk results with the separators that followed each source chunk"""
+    return "".join(result + separator for result, (_, separator) in zip(results, chunks))
+
+def _map_chunks(
+    func: Callable[[str], Any],
+    chunks: List[str],
+    progress_cb: Optional[ProgressCallback] = None
+) -> List[Any]:
+    """Apply func to every chunk, concurrently on the shared pool when there is more than one
+    
+    progress_cb, if given, is called from the calling thread as each chunk finishes.
+    """
+    if len(chunks) == 1:
+        results = [func(chunks[0])]
+        if progress_cb:
+            progress_cb(TRANSLATION_PROGRESS_END, "Translated section 1 of 1")
+        return results
+    
+    futures = [_EXECUTOR.submit(func, chunk) for chunk in chunks]
+    if progress_cb:
+        span = TRANSLATION_PROGRESS_END - TRANSLATION_PROGRESS_START
+        for done, _ in enumerate(as_completed(futures), 1):
+            progress_cb(TRANSLATION_PROGRESS_START + span * done // len(futures), f"Translated section {done} of {len(futures)}")
+    return [future.result() for future in futures]
+
+def _build_translation_context(
+    document_analysis: Dict[str, Any],
+    quebec_glossary: Optional[Dict[str, str]] = None
+) -> Tuple[str, str, str]:
+    """Return the translator system prompt, per-document guidance built from the analysis and the glossary block"""
     doc_type = document_analysis.get("document_type", "unknown")
     complexity = document_analysis.get("complexity_level", "medium")
     technical_terms = document_analysis.get("technical_terminology", [])
     cultural_refs = document_analysis.get("cultural_references", [])
     
-    # Build system prompt based on analysis
-    system_prompt = f"""You are an expert Quebec French translator specialized in {doc_type} documents with {complexity} 
-    complexity. You are translating for a Quebec audience and must use Quebec French vocabulary, expressions, and grammar 
-    patterns. Translate accurately while preserving the original formatting, tone, and style.
-    
-    Important Quebec French translation guidelines:
-    1. Use Quebec French terminology and expressions rather than International French
-    2. Apply Quebec grammar conventions (including contractions like "y'a" instead of "il y a" in informal contexts)
-    3. Use Quebec idioms and colloquialisms where appropriate for the context
-    4. Adapt cultural references for a Quebec audience
-    5. For technical content, use terms familiar to Quebec professionals in that field
-    6. Preserve the original formatting, paragraph structure, and style
-    7. For informal content, consider using appropriate joual expressions if the context allows it"""
+    # The system prompt stays static so it is a stable cache prefix; the analysis goes into the message
+    document_profile_str = f"This is a {doc_type} document with {complexity} translation complexity."
     
     # Add technical terms glossary if available
     technical_terms_str = ""
@@ -181,27 +519,56 @@ def translate_document_to_quebec_french(
         else:
             cultural_refs_str = f"\nCultural references to adapt for Quebec audience:\n{cultural_refs}"
     
-    # Get Quebec French glossary
-    quebec_glossary = create_quebec_french_glossary()
-    glossary_str = "\nQuebec French vocabulary guidelines:\n" + json.dumps(quebec_glossary, indent=2)
+    # Use the process-wide glossary block unless the caller supplies its own glossary
+    if quebec_glossary is None:
+        glossary_str = quebec_french_glossary_block()
+    else:
+        glossary_str = _format_glossary(quebec_glossary)
+    
+    return TRANSLATION_SYSTEM_PROMPT, f"{document_profile_str}\n{technical_terms_str}\n{cultural_refs_str}", glossary_str
+
+def translate_document_to_quebec_french(
+    text_content: str, 
+    document_analysis: Dict[str, Any],
+    quebec_glossary: Optional[Dict[str, str]] = None,
+    progress_cb: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """Translate document content to Quebec French while preserving formatting and style"""
+    if not text_content:
+        return {"error": "No text content provided"}
+    
+    system_prompt, guidance_str, glossary_str = _build_translation_context(document_analysis, quebec_glossary)
     
-    translation_prompt = f"""Please translate the following text from English to Quebec French (Canadian French). 
+    def translate_chunk(chunk: str) -> str:
+        if _is_trivial(chunk):
+            return chunk
+        
+        # The glossary is identical for every chunk, so it goes first as a cacheable prefix
+        translation_prompt = f"""Please translate the following text from English to Quebec French (Canadian French). 
 This translation is specifically intended for a Quebec audience, not a general French-speaking audience.
 
-{technical_terms_str}
-{cultural_refs_str}
-{glossary_str}
+{guidance_str}
 
 TEXT TO TRANSLATE:
-{text_content}
+{chunk}
 
 Translation (in Quebec French):"""
+        
+        return invoke_bedrock_claude(
+            prompt=translation_prompt,
+            system=system_prompt,
+            cache_prefix=glossary_str,
+            max_tokens=_output_token_budget(chunk),  # Adjust max tokens based on input length
+            require_complete=True
+        )
     
-    translation = invoke_bedrock_claude(
-        prompt=translation_prompt,
-        system=system_prompt,
-        max_tokens=min(100000, len(text_content) * 2)  # Adjust max tokens based on input length
-    )
+    # Long documents are translated paragraph-aligned chunk by chunk, in parallel
+    chunks = _chunk_text(text_content)
+    try:
+        translation = _join_chunks(_map_chunks(translate_chunk, [chunk for chunk, _ in chunks], progress_cb), chunks)
+    except OutputTruncatedError as e:
+        # A cut-off translation must not be returned (or cached) as a complete one
+        return {"error": f"Translation was cut off: {e}"}
     
     return {
         "original_text": text_content,
@@ -209,107 +576,137 @@ Translation (in Quebec French):"""
         "target_language": "Quebec French"
     }
 
+def translate_review_enhance(
+    text_content: str, 
+    document_analysis: Dict[str, Any],
+    quebec_glossary: Optional[Dict[str, str]] = None,
+    progress_cb: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """Translate, self-review and enhance a document for Quebec French in a single model call"""
+    if not text_content:
+        return {"error": "No text content provided"}
+    
+    system_prompt, guidance_str, glossary_str = _build_translation_context(document_analysis, quebec_glossary)
+    
+    def translate_chunk(chunk: str) -> Dict[str, Any]:
+        if _is_trivial(chunk):
+            return {"review": {"overall_quality": 10, "quebec_french_authenticity": 10}, "final": chunk}
+        
+        fused_prompt = f"""Please translate the following text from English to Quebec French (Canadian French). 
+This translation is specifically intended for a Quebec audience, not a general French-speaking audience.
+
+{guidance_str}
+
+TEXT TO TRANSLATE:
+{chunk}
+
+Work in three passes:
+1. Draft the Quebec French translation
+2. Review the draft for accuracy, fluency, style preservation and Quebec French authenticity, noting any 
+   International French terms that should be replaced with Quebec equivalents
+3. Apply your review to produce the final, authentically Quebec French version
+
+Respond with only a JSON object of this form:
+{{"review": {{"overall_quality": <1-10>, "quebec_french_authenticity": <1-10>, "accuracy": <1-10>, "fluency": <1-10>, 
+"style_preservation": <1-10>, "international_french_terms": [...], "cultural_adaptations": "...", 
+"suggested_corrections": [...]}}, "final": "<final Quebec French translation>"}}"""
+        
+        fused_result = invoke_bedrock_claude(
+            prompt=fused_prompt,
+            system=system_prompt,
+            cache_prefix=glossary_str,
+            max_tokens=_output_token_budget(chunk, extra=1000)  # Room for the review alongside the translation
+        )
+        return extract_json(fused_result)
+    
+    chunks = _chunk_text(text_content)
+    chunk_results = _map_chunks(translate_chunk, [chunk for chunk, _ in chunks], progress_cb)
+    
+    # An empty final is only acceptable for a chunk with nothing to translate
+    if any(
+        not isinstance(data.get("final"), str) or not (data["final"] or _is_trivial(chunk))
+        for data, (chunk, _) in zip(chunk_results, chunks)
+    ):
+        return {"error": "Could not parse the combined translation response"}
+    
+    reviews = [data["review"] if isinstance(data.get("review"), dict) else {} for data in chunk_results]
+    if len(reviews) == 1:
+        review_data = reviews[0]
+    else:
+        # Judge a chunked document by its weakest chunk
+        review_data = {
+            "overall_quality": min(ReviewScores.from_review(review).overall_quality for review in reviews),
+            "quebec_french_authenticity": min(ReviewScores.from_review(review).quebec_authenticity for review in reviews),
+            "chunk_reviews": reviews
+        }
+    
+    return {
+        "original_text": text_content,
+        "translated_text": _join_chunks([data["final"] for data in chunk_results], chunks),
+        "quality_review": review_data,
+        "target_language": "Quebec French"
+    }
+
 def check_quebec_french_quality(
     original_text: str, 
-    translated_text: str
+    translated_text: str,
+    quality_threshold: int = 7
 ) -> Dict[str, Any]:
     """Verify Quebec French translation quality and make corrections if needed"""
     if not original_text or not translated_text:
         return {"error": "Missing original or translated text"}
     
-    system_prompt = """You are an expert Quebec French reviewer with deep knowledge of Quebec language and culture. 
-    Your task is to review translations for accuracy, fluency, and whether they properly reflect Quebec French 
-    rather than International French. You should identify any terms or expressions that sound like International 
-    French and provide Quebec alternatives."""
+    # Nothing translatable was passed through unchanged, so there is nothing to review
+    if translated_text == original_text and _is_trivial(original_text):
+        return {
+            "translated_text": translated_text,
+            "quality_review": {"overall_quality": 10, "quebec_french_authenticity": 10}
+        }
+    
+    system_prompt = QUALITY_REVIEW_SYSTEM_PROMPT
     
     # For long texts, check a sample of the beginning, middle and end
     if len(original_text) > 3000:
-        # Get samples from beginning, middle and end
-        orig_samples = [
-            original_text[:1000],
-            original_text[len(original_text)//2-500:len(original_text)//2+500],
-            original_text[-1000:]
-        ]
+        orig_begin, orig_middle, orig_end = _samples(original_text)
+        trans_begin, trans_middle, trans_end = _samples(translated_text)
         
-        trans_samples = [
-            translated_text[:1000],
-            translated_text[len(translated_text)//2-500:len(translated_text)//2+500],
-            translated_text[-1000:]
-        ]
-        
-        review_prompt = f"""Review the quality of this translation from English to Quebec French.
-
-ORIGINAL TEXT (SAMPLES):
-Beginning: {orig_samples[0]}
+        texts_str = f"""ORIGINAL TEXT (SAMPLES):
+Beginning: {orig_begin}
 
-Middle: {orig_samples[1]}
+Middle: {orig_middle}
 
-End: {orig_samples[2]}
+End: {orig_end}
 
 TRANSLATION (CORRESPONDING SECTIONS):
-Beginning: {trans_samples[0]}
+Beginning: {trans_begin}
 
-Middle: {trans_samples[1]}
+Middle: {trans_middle}
 
-End: {trans_samples[2]}
-
-Please provide:
-1. Overall quality assessment (1-10)
-2. Quebec French authenticity (1-10, where 10 means perfectly Quebec French)
-3. Accuracy assessment (1-10)
-4. Fluency assessment (1-10)
-5. Style preservation assessment (1-10)
-6. International French terms that should be replaced with Quebec equivalents
-7. Cultural adaptations assessment
-8. Suggested corrections to make the text more authentically Quebec French
-
-Respond in JSON format.
-"""
+End: {trans_end}"""
     else:
-        review_prompt = f"""Review the quality of this translation from English to Quebec French.
-
-ORIGINAL TEXT:
+        texts_str = f"""ORIGINAL TEXT:
 {original_text}
 
 TRANSLATION:
-{translated_text}
+{translated_text}"""
+    
+    review_prompt = f"""Review the quality of this translation from English to Quebec French.
 
-Please provide:
-1. Overall quality assessment (1-10)
-2. Quebec French authenticity (1-10, where 10 means perfectly Quebec French)
-3. Accuracy assessment (1-10)
-4. Fluency assessment (1-10)
-5. Style preservation assessment (1-10)
-6. International French terms that should be replaced with Quebec equivalents
-7. Cultural adaptations assessment
-8. Suggested corrections to make the text more authentically Quebec French
+{texts_str}
 
-Respond in JSON format.
+{REVIEW_CRITERIA}
 """
     
     review_result = invoke_bedrock_claude(review_prompt, system_prompt, max_tokens=4000)
     review_data = extract_json(review_result)
     
     # If quality is low or Quebec French authenticity is low, make corrections
-    overall_quality = review_data.get("overall_quality", 0)
-    quebec_authenticity = review_data.get("quebec_french_authenticity", 0)
-    
-    if isinstance(overall_quality, str):
-        try:
-            overall_quality = int(overall_quality)
-        except ValueError:
-            overall_quality = 0
-            
-    if isinstance(quebec_authenticity, str):
-        try:
-            quebec_authenticity = int(quebec_authenticity)
-        except ValueError:
-            quebec_authenticity = 0
+    scores = ReviewScores.from_review(review_data)
     
     final_translation = translated_text
     
-    # If quality is below 7 or Quebec authenticity is below 8, try to improve the translation
-    if (overall_quality < 7 or quebec_authenticity < 8) and "suggested_corrections" in review_data:
+    # If quality is below the threshold or Quebec authenticity is below 8, try to improve the translation
+    if (scores.overall_quality < quality_threshold or scores.quebec_authenticity < 8) and "suggested_corrections" in review_data:
         correction_prompt = f"""Please correct the following translation based on these issues to make it more authentic Quebec French:
 
 ORIGINAL TEXT:
@@ -319,20 +716,15 @@ CURRENT TRANSLATION:
 {translated_text}
 
 ISSUES IDENTIFIED:
-International French terms: {json.dumps(review_data.get("international_french_terms", "No specific terms identified"))}
+International French terms: {_dumps(review_data.get("international_french_terms", "No specific terms identified")).decode("utf-8")}
 
 SUGGESTED CORRECTIONS:
-{json.dumps(review_data.get("suggested_corrections", "No corrections suggested"))}
+{_dumps(review_data.get("suggested_corrections", "No corrections suggested")).decode("utf-8")}
 
 Please provide the improved Quebec French translation:
 """
         
-        improved_translation = invoke_bedrock_claude(
-            prompt=correction_prompt, 
-            system=system_prompt, 
-            max_tokens=min(100000, len(translated_text) * 2)
-        )
-        final_translation = improved_translation
+        final_translation = _rewrite_whole_text(correction_prompt, system_prompt, translated_text)
     
     return {
         "translated_text": final_translation,
@@ -347,10 +739,7 @@ def enhance_quebec_french_translation(
     if not translated_text:
         return translated_text
     
-    system_prompt = """You are an expert in Quebec French localization and cultural adaptation. Your task is to 
-    enhance translations to make them culturally authentic and linguistically appropriate for a Quebec audience.
-    You understand the nuances between International French vs. Quebec French, including vocabulary differences, 
-    grammar patterns, expressions, and cultural references."""
+    system_prompt = ENHANCEMENT_SYSTEM_PROMPT
     
     enhancement_prompt = f"""Enhance the following translation to better match Quebec French regional dialect, expressions, 
     and cultural nuances:
@@ -370,49 +759,171 @@ def enhance_quebec_french_translation(
     
     Provide an improved translation that sounds authentically Quebec French:"""
     
-    enhanced_translation = invoke_bedrock_claude(
-        prompt=enhancement_prompt, 
-        system=system_prompt, 
-        max_tokens=min(100000, len(translated_text) * 2)
-    )
-    
-    return enhanced_translation
+    # A cut-off enhancement must never replace the complete translation
+    return _rewrite_whole_text(enhancement_prompt, system_prompt, translated_text)
+
+def _translation_cache_key(text_content: str, quality_threshold: int, fuse_stages: bool) -> str:
+    """Hash the input text together with the settings that affect the translation"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{MODEL_ID}|{quality_threshold}|{fuse_stages}|".encode("utf-8"))
+    digest.update(text_content.encode("utf-8"))
+    return digest.hexdigest()
+
+def _get_cached_translation(key: str) -> Optional[Dict[str, Any]]:
+    """Return a previously stored translation result, if any"""
+    try:
+        with _CACHE_LOCK, shelve.open(TRANSLATION_CACHE_PATH, flag="r") as cache:
+            return cache.get(key)
+    except Exception:
+        # Missing or unreadable cache file counts as a miss
+        return None
+
+def _store_cached_translation(key: str, result: Dict[str, Any]) -> None:
+    """Persist a finished translation result"""
+    try:
+        os.makedirs(os.path.dirname(TRANSLATION_CACHE_PATH), exist_ok=True)
+        with _CACHE_LOCK, shelve.open(TRANSLATION_CACHE_PATH) as cache:
+            cache[key] = result
+    except Exception as e:
+        print(f"Warning: could not write translation cache: {e}")
 
 def process_document_for_quebec_french(
     text_content: str,
-    quality_threshold: int = 7
+    quality_threshold: int = 7,
+    fuse_stages: bool = True,
+    use_cache: bool = True,
+    progress_cb: Optional[ProgressCallback] = None,
+    quebec_glossary: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Run the complete Quebec French translation workflow, reusing cached results for repeated documents
+    
+    quebec_glossary, if given, is used instead of the process-wide glossary.
+    """
+    # Whitespace, numbers and punctuation come back unchanged without any model call
+    if text_content and _is_trivial(text_content):
+        return {
+            "original_text": text_content,
+            "translated_text": text_content,
+            "document_analysis": {"document_type": "trivial", "complexity_level": "low"},
+            "quality_review": {"overall_quality": 10, "quebec_french_authenticity": 10},
+            "target_language": "Quebec French"
+        }
+    
+    if not use_cache or not text_content:
+        return _run_quebec_french_pipeline(text_content, quality_threshold, fuse_stages, progress_cb, quebec_glossary)
+    
+    cache_key = _translation_cache_key(text_content, quality_threshold, fuse_stages)
+    cached_result = _get_cached_translation(cache_key)
+    if cached_result is not None:
+        return cached_result
+    
+    result = _run_quebec_french_pipeline(text_content, quality_threshold, fuse_stages, progress_cb, quebec_glossary)
+    if "error" not in result:
+        _store_cached_translation(cache_key, result)
+    return result
+
+def _run_quebec_french_pipeline(
+    text_content: str,
+    quality_threshold: int,
+    fuse_stages: bool,
+    progress_cb: Optional[ProgressCallback] = None,
+    quebec_glossary: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
-    """Run the complete Quebec French translation workflow"""
+    """Run the Quebec French translation stages for one document
+    
+    With fuse_stages the translation, review and enhancement happen in one model call; the separate
+    enhancement pass only runs when that review scores the result below the quality bar. If the
+    combined response cannot be parsed, the staged pipeline runs instead. In the staged pipeline the
+    enhancement is skipped for reviews scoring 9+, and a quality_threshold of 0 skips the review.
+    """
+    
+    report = progress_cb or (lambda pct, message: None)
     
-    # Step 1: Document analysis
+    # Step 1: Document analysis, with the document-independent glossary generated alongside it unless supplied
+    report(5, "🔍 Analyzing document structure and content...")
+    glossary_future = _EXECUTOR.submit(quebec_french_glossary) if quebec_glossary is None else None
     analysis_result = analyze_document(text_content)
     
     if "error" in analysis_result:
+        if glossary_future is not None:
+            glossary_future.cancel()
         return {"error": analysis_result["error"], "stage": "document_analysis"}
     
+    # Wait for the glossary; the same dict is handed to whichever translation stage runs
+    report(20, "📚 Creating Quebec French terminology glossary...")
+    if glossary_future is not None:
+        quebec_glossary = glossary_future.result()
+    report(TRANSLATION_PROGRESS_START, "📝 Translating to Quebec French...")
+    
+    # Steps 2-4 fused: translate, self-review and enhance in one call
+    if fuse_stages:
+        fused_result = translate_review_enhance(
+            text_content,
+            analysis_result.get("document_analysis", {}),
+            quebec_glossary,
+            progress_cb=progress_cb
+        )
+        
+        if "error" not in fused_result:
+            review_data = fused_result["quality_review"]
+            scores = ReviewScores.from_review(review_data)
+            
+            translated_text = fused_result["translated_text"]
+            if scores.overall_quality < quality_threshold or scores.quebec_authenticity < 8:
+                report(90, "🍁 Adding regional Quebec French expressions...")
+                translated_text = enhance_quebec_french_translation(text_content, translated_text)
+            
+            return {
+                "original_text": text_content,
+                "translated_text": translated_text,
+                "document_analysis": analysis_result.get("document_analysis", {}),
+                "quality_review": review_data,
+                "target_language": "Quebec French"
+            }
+    
     # Step 2: Quebec French translation
     translation_result = translate_document_to_quebec_french(
         text_content, 
-        analysis_result.get("document_analysis", {})
+        analysis_result.get("document_analysis", {}),
+        quebec_glossary,
+        progress_cb=progress_cb
     )
     
     if "error" in translation_result:
         return {"error": translation_result["error"], "stage": "translation"}
     
+    # A threshold of 0 accepts any quality, so skip the review and enhancement calls altogether
+    if quality_threshold <= 0:
+        return {
+            "original_text": text_content,
+            "translated_text": translation_result.get("translated_text", ""),
+            "document_analysis": analysis_result.get("document_analysis", {}),
+            "quality_review": {},
+            "target_language": "Quebec French"
+        }
+    
     # Step 3: Quebec French quality check
+    report(TRANSLATION_PROGRESS_END, "⚜️ Verifying Quebec French authenticity...")
     quality_result = check_quebec_french_quality(
         text_content,
-        translation_result.get("translated_text", "")
+        translation_result.get("translated_text", ""),
+        quality_threshold=quality_threshold
     )
     
     if "error" in quality_result:
         return {"error": quality_result["error"], "stage": "quality_check"}
     
-    # Step 4: Quebec French enhancement
-    enhanced_translation = enhance_quebec_french_translation(
-        text_content,
-        quality_result.get("translated_text", "")
-    )
+    scores = ReviewScores.from_review(quality_result.get("quality_review", {}))
+    
+    # Step 4: Quebec French enhancement, skipped when the review already rates the translation excellent
+    if scores.overall_quality >= 9 and scores.quebec_authenticity >= 9:
+        enhanced_translation = quality_result.get("translated_text", "")
+    else:
+        report(90, "🍁 Adding regional Quebec French expressions...")
+        enhanced_translation = enhance_quebec_french_translation(
+            text_content,
+            quality_result.get("translated_text", "")
+        )
     
     # Return the final result
     return {
@@ -424,14 +935,25 @@ def process_document_for_quebec_french(
     }
 
 def batch_translate_to_quebec_french(
-    documents: Dict[str, str]
+    documents: Dict[str, str],
+    max_parallel_requests: Optional[int] = None
 ) -> Dict[str, Dict[str, Any]]:
-    """Process multiple documents in batch for Quebec French translation"""
-    results = {}
-    
-    for doc_name, content in documents.items():
-        print(f"Processing document for Quebec French translation: {doc_name}")
-        results[doc_name] = process_document_for_quebec_french(content)
+    """Process multiple documents in batch for Quebec French translation, several documents at a time"""
+    max_workers = max_parallel_requests or (os.cpu_count() or 1) * 5
+    
+    # Resolve the glossary before fan-out so the workers share it instead of each generating one
+    quebec_glossary = quebec_french_glossary()
+    
+    # A dedicated pool so document workers never wait on slots in the shared _EXECUTOR they feed
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for doc_name, content in documents.items():
+            print(f"Processing document for Quebec French translation: {doc_name}")
+            futures[doc_name] = executor.submit(
+                process_document_for_quebec_french, content, quebec_glossary=quebec_glossary
+            )
+        
+        results = {doc_name: future.result() for doc_name, future in futures.items()}
         
     return results
 
@@ -1,46 +1,158 @@
 # app.py
 import streamlit as st
-import mammoth
-import os
-import docx
-import tempfile
-import base64
-from io import BytesIO
+import hashlib
+import pickle
+import zipfile
+import zlib
+from io import BytesIO, StringIO
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
 from quebec_translation import process_document_for_quebec_french
 
-def extract_text_from_docx(file_path):
-    """Extract text from a .docx file"""
-    with open(file_path, "rb") as docx_file:
-        result = mammoth.extract_raw_text(docx_file)
-        return result.value
+try:
+    import zstandard
+except ImportError:  # fall back to the stdlib zlib codec
+    zstandard = None
 
-def extract_text_from_txt(file_path):
-    """Extract text from a .txt file"""
-    with open(file_path, "r", encoding="utf-8") as f:
-        return f.read()
+# WordprocessingML element names used by the raw-text extractor
+W_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_PARAGRAPH = W_NAMESPACE + "p"
+W_TEXT = W_NAMESPACE + "t"
+W_TAB = W_NAMESPACE + "tab"
+W_BREAK = W_NAMESPACE + "br"
 
-def create_download_link(content, filename, link_text):
-    """Generate a download link for text content"""
-    b64 = base64.b64encode(content.encode()).decode()
-    href = f'<a href="data:file/txt;base64,{b64}" download="{filename}">{link_text}</a>'
-    return href
+# Text areas show at most this many characters; every rerun resends their full value to the browser
+PREVIEW_CHARS = 20000
 
-def save_docx(text, filename):
-    """Save text to a .docx file and create download link"""
-    # Create a docx file
+# Quebec flag colors
+QUEBEC_BLUE = "#095797"
+QUEBEC_WHITE = "#FFFFFF"
+
+# Static HTML/markdown blocks, built once at import instead of on every rerun
+QUEBEC_CSS = f"""
+<style>
+.main-header {{
+    color: {QUEBEC_BLUE};
+}}
+.stProgress > div > div {{
+    background-color: {QUEBEC_BLUE};
+}}
+</style>
+"""
+
+ABOUT_MARKDOWN = """
+This app uses AI to translate documents to authentic Quebec French while preserving:
+- Original formatting and document structure
+- Quebec French terminology and expressions
+- Cultural context adaptations for Quebec audiences
+- Technical terminology with Quebec French equivalents
+- Regional dialect nuances when applicable
+"""
+
+QUEBEC_FRENCH_CARD = """
+<div style='background-color:#f0f2f6;padding:10px;border-radius:5px;margin-top:20px'>
+<h4>What is Quebec French?</h4>
+<p>Quebec French (français québécois) is the predominant variety of French spoken in Canada, 
+with its own distinct vocabulary, expressions, grammar patterns, and pronunciation. It differs 
+significantly from International French in many aspects.</p>
+</div>
+"""
+
+LANGUAGE_TIPS_MARKDOWN = """
+### 💡 Quebec French Language Tips
+
+This translation uses authentic Quebec French expressions and terminology. Some key differences from International French include:
+
+- Different vocabulary choices unique to Quebec
+- Contractions and speech patterns common in Quebec
+- Cultural references adapted for Quebec audiences
+- Technical terminology using Quebec industry standards
+"""
+
+@st.cache_data(show_spinner=False)
+def extract_text_from_docx(file_bytes: bytes) -> str:
+    """Extract text from the bytes of a .docx file (cached per upload content)"""
+    # Stream word/document.xml and keep only text runs, skipping styles, numbering and relationships
+    paragraphs = []
+    parts = []
+    with zipfile.ZipFile(BytesIO(file_bytes)) as docx_zip, docx_zip.open("word/document.xml") as document_xml:
+        for _, element in ElementTree.iterparse(document_xml):
+            if element.tag == W_TEXT:
+                parts.append(element.text or "")
+            elif element.tag == W_TAB:
+                parts.append("\t")
+            elif element.tag == W_BREAK:
+                parts.append("\n")
+            elif element.tag == W_PARAGRAPH:
+                paragraphs.append("".join(parts))
+                parts = []
+                element.clear()
+    return "\n\n".join(paragraphs)
+
+@st.cache_data(show_spinner=False)
+def extract_text_from_txt(file_bytes: bytes) -> str:
+    """Extract text from the bytes of a .txt file (cached per upload content)"""
+    return file_bytes.decode("utf-8")
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def translate_to_quebec_french(text_content: str, _progress_cb=None) -> dict:
+    """Run the Quebec French translation pipeline, cached per document text"""
+    # This is the in-process front stage; process_document_for_quebec_french also keeps finished results
+    # in its on-disk cache (QUEBEC_TRANSLATION_CACHE), so translations survive worker restarts.
+    # The sidebar parameters are not consumed by the backend yet, so they are not part of the key;
+    # the underscore keeps the progress callback out of it too
+    return process_document_for_quebec_french(text_content, progress_cb=_progress_cb)
+
+def _preview(text: str) -> str:
+    """Truncate long text for on-page display; the downloads carry the full content"""
+    if len(text) <= PREVIEW_CHARS:
+        return text
+    return text[:PREVIEW_CHARS] + "…"
+
+def _pack_result(result: dict) -> bytes:
+    """Pickle and compress a translation result for storage in session state"""
+    payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(payload)
+    return zlib.compress(payload, 6)
+
+def _unpack_result(blob: bytes) -> dict:
+    """Restore a translation result packed by _pack_result"""
+    if zstandard is not None:
+        payload = zstandard.ZstdDecompressor().decompress(blob)
+    else:
+        payload = zlib.decompress(blob)
+    return pickle.loads(payload)
+
+def _paragraph_xml(line):
+    """Render one line of text as a WordprocessingML paragraph"""
+    if not line:
+        return "<w:p/>"
+    # Tabs become w:tab elements, as python-docx's add_run does
+    runs = '</w:t><w:tab/><w:t xml:space="preserve">'.join(escape(part) for part in line.split("\t"))
+    return f'<w:p><w:r><w:t xml:space="preserve">{runs}</w:t></w:r></w:p>'
+
+def save_docx(text):
+    """Build a .docx file from text and return its bytes"""
+    import docx  # deferred: python-docx pulls in lxml, only needed once a translation exists
+    from docx.oxml import parse_xml
+    from docx.oxml.ns import nsdecls
+    
+    # Create a docx file, parsing all paragraphs as one XML fragment instead of one add_paragraph call per line
     doc = docx.Document()
-    for paragraph in text.split('\n'):
-        doc.add_paragraph(paragraph)
+    # Universal newlines treat \r\n and \r like \n, and a trailing newline adds no empty paragraph
+    paragraphs_xml = "".join(_paragraph_xml(line.rstrip("\n")) for line in StringIO(text, newline=None))
+    fragment = parse_xml(f'<w:body {nsdecls("w")}>{paragraphs_xml}</w:body>')
+    
+    # Paragraphs go ahead of the trailing section properties
+    body = doc.element.body
+    insert_at = len(body) - 1 if body.sectPr is not None else len(body)
+    body[insert_at:insert_at] = list(fragment)
     
     # Save to BytesIO object
     tmp = BytesIO()
     doc.save(tmp)
-    tmp.seek(0)
-    
-    # Create download link
-    b64 = base64.b64encode(tmp.getvalue()).decode()
-    href = f'<a href="data:application/vnd.openxmlformats-officedocument.wordprocessingml.document;base64,{b64}" download="{filename}">{filename}</a>'
-    return href
+    return tmp.getvalue()
 
 def main():
     st.set_page_config(
@@ -49,23 +161,7 @@ def main():
         initial_sidebar_state="expanded"
     )
     
-    # Quebec flag colors
-    quebec_blue = "#095797"
-    quebec_white = "#FFFFFF"
-    
-    st.markdown(
-        f"""
-        <style>
-        .main-header {{
-            color: {quebec_blue};
-        }}
-        .stProgress > div > div {{
-            background-color: {quebec_blue};
-        }}
-        </style>
-        """,
-        unsafe_allow_html=True
-    )
+    st.markdown(QUEBEC_CSS, unsafe_allow_html=True)
     
     st.markdown("<h1 class='main-header'>🍁 AI Quebec French Document Translator</h1>", unsafe_allow_html=True)
     st.markdown("Upload documents (.txt, .docx) and translate them to authentic Quebec French")
@@ -102,50 +198,40 @@ def main():
         
         st.divider()
         st.markdown("### About")
-        st.markdown("""
-        This app uses AI to translate documents to authentic Quebec French while preserving:
-        - Original formatting and document structure
-        - Quebec French terminology and expressions
-        - Cultural context adaptations for Quebec audiences
-        - Technical terminology with Quebec French equivalents
-        - Regional dialect nuances when applicable
-        """)
+        st.markdown(ABOUT_MARKDOWN)
         
-        st.markdown("""
-        <div style='background-color:#f0f2f6;padding:10px;border-radius:5px;margin-top:20px'>
-        <h4>What is Quebec French?</h4>
-        <p>Quebec French (français québécois) is the predominant variety of French spoken in Canada, 
-        with its own distinct vocabulary, expressions, grammar patterns, and pronunciation. It differs 
-        significantly from International French in many aspects.</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(QUEBEC_FRENCH_CARD, unsafe_allow_html=True)
     
     uploaded_file = st.file_uploader("Upload a document", type=["txt", "docx", "doc"])
     
     if uploaded_file is not None:
-        # Create a temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix="." + uploaded_file.name.split(".")[-1]) as tmp:
-            tmp.write(uploaded_file.getvalue())
-            temp_file_path = tmp.name
-        
-        # Extract text based on file type
-        file_extension = uploaded_file.name.split(".")[-1].lower()
-        if file_extension == "docx":
-            text_content = extract_text_from_docx(temp_file_path)
-        elif file_extension == "txt":
-            text_content = extract_text_from_txt(temp_file_path)
-        else:
+        # Extract text based on file type, straight from the uploaded bytes
+        file_stem, _, file_extension = uploaded_file.name.rpartition(".")
+        file_extension = file_extension.lower()
+        if file_extension not in ("docx", "txt"):
             st.error("Unsupported file format. Please upload .txt or .docx files.")
-            os.unlink(temp_file_path)
             return
         
-        # Remove temp file
-        os.unlink(temp_file_path)
+        # Key the upload by content, not filename; only re-extract when it changes so reruns reuse the session copy
+        file_bytes = uploaded_file.getvalue()
+        upload_key = hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
+        if st.session_state.get("upload_key") != upload_key:
+            if file_extension == "docx":
+                st.session_state.text_content = extract_text_from_docx(file_bytes)
+            else:
+                st.session_state.text_content = extract_text_from_txt(file_bytes)
+            st.session_state.upload_key = upload_key
+            st.session_state.pop("translation_result_blob", None)
+            st.session_state.pop("translation_downloads", None)
+        text_content = st.session_state.text_content
         
         # Display original text
         st.subheader("Original Document")
-        with st.expander("Show Original Content", expanded=True):
-            st.text_area("Original Text", text_content, height=300)
+        with st.expander("Show Original Content", expanded=False):
+            st.text_area("Original Text", _preview(text_content), height=300)
+            if len(text_content) > PREVIEW_CHARS:
+                st.caption(f"Showing the first {PREVIEW_CHARS:,} of {len(text_content):,} characters.")
+                st.download_button("Download original", data=file_bytes, file_name=uploaded_file.name)
         
         # Translation section
         st.subheader("Quebec French Translation")
@@ -160,127 +246,125 @@ def main():
         
         # Start translation button
         if st.button("Translate to Quebec French"):
-            with st.spinner("Translating document to Quebec French..."):
-                # Progress tracking
+            # Progress is driven by the pipeline stages as they actually run
+            with st.status("Translating document to Quebec French...", expanded=True) as status:
                 progress_bar = st.progress(0)
                 
-                # Step 1: Document analysis
-                st.markdown("🔍 Analyzing document structure and content...")
-                progress_bar.progress(20)
-                
-                # Step 2: Quebec French glossary creation
-                st.markdown("📚 Creating Quebec French terminology glossary...")
-                progress_bar.progress(35)
-                
-                # Step 3: Translation
-                st.markdown("📝 Translating to Quebec French...")
-                progress_bar.progress(55)
-                
-                # Step 4: Quebec authenticity check
-                st.markdown("⚜️ Verifying Quebec French authenticity...")
-                progress_bar.progress(75)
-                
-                # Step 5: Regional adaptations
-                st.markdown("🍁 Adding regional Quebec French expressions...")
-                progress_bar.progress(90)
+                def report_progress(pct, message):
+                    progress_bar.progress(pct)
+                    status.update(label=message)
                 
-                # Run the full translation process
-                result = process_document_for_quebec_french(text_content)
+                result = translate_to_quebec_french(text_content, _progress_cb=report_progress)
                 
                 progress_bar.progress(100)
-                st.success("Quebec French translation completed!")
-                
                 if "error" in result:
-                    st.error(f"Error during {result.get('stage', 'translation')}: {result['error']}")
+                    status.update(label="Quebec French translation failed", state="error")
                 else:
-                    # Display translated text
-                    st.text_area("Quebec French Translation", result["translated_text"], height=300)
-                    
-                    # Download options
-                    st.subheader("Download Options")
-                    col1, col2 = st.columns(2)
-                    
-                    # Download as TXT
-                    with col1:
-                        txt_download = create_download_link(
-                            result["translated_text"], 
-                            f"{uploaded_file.name.split('.')[0]}_quebec_french.txt",
-                            "Download as TXT"
-                        )
-                        st.markdown(txt_download, unsafe_allow_html=True)
-                    
-                    # Download as DOCX
-                    with col2:
-                        docx_download = save_docx(
-                            result["translated_text"],
-                            f"{uploaded_file.name.split('.')[0]}_quebec_french.docx"
-                        )
-                        st.markdown(docx_download, unsafe_allow_html=True)
-                    
-                    # Quebec French specific insights
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        with st.expander("Quebec French Terminology Used"):
-                            if "document_analysis" in result and result["document_analysis"]:
-                                if "quebec_terminology" in result["document_analysis"]:
-                                    st.json(result["document_analysis"]["quebec_terminology"])
-                                else:
-                                    st.write("No specific Quebec terminology analysis available.")
-                            else:
-                                st.write("No terminology analysis available.")
-                    
-                    with col2:
-                        with st.expander("Quebec French Authenticity Score"):
-                            if "quality_review" in result and result["quality_review"]:
-                                if "quebec_french_authenticity" in result["quality_review"]:
-                                    authenticity = result["quality_review"]["quebec_french_authenticity"]
-                                    st.metric("Authenticity Score", f"{authenticity}/10")
-                                    
-                                    if isinstance(authenticity, (int, float)) or (isinstance(authenticity, str) and authenticity.isdigit()):
-                                        auth_score = float(authenticity)
-                                        if auth_score >= 8:
-                                            st.success("Excellent Quebec French authenticity!")
-                                        elif auth_score >= 6:
-                                            st.info("Good Quebec French authenticity with some room for improvement.")
-                                        else:
-                                            st.warning("The translation may need more Quebec French expressions.")
-                                else:
-                                    st.write("No authenticity score available.")
-                            else:
-                                st.write("No quality review available.")
-                    
-                    # Display full document analysis if available
+                    status.update(label="Quebec French translation completed!", state="complete", expanded=False)
+            
+            # Sessions only hold the compressed result; it is unpacked once per rerun below
+            st.session_state.translation_result_blob = _pack_result(result)
+            st.session_state.pop("translation_downloads", None)
+        
+        result_blob = st.session_state.get("translation_result_blob")
+        if result_blob is None:
+            return
+        result = _unpack_result(result_blob)
+        
+        if "error" in result:
+            st.error(f"Error during {result.get('stage', 'translation')}: {result['error']}")
+        else:
+            # Display translated text
+            st.text_area("Quebec French Translation", _preview(result["translated_text"]), height=300)
+            if len(result["translated_text"]) > PREVIEW_CHARS:
+                st.caption(f"Showing the first {PREVIEW_CHARS:,} characters; download the full translation below.")
+            
+            # Download payloads are built once per translation and reused on reruns
+            downloads = st.session_state.get("translation_downloads")
+            if downloads is None:
+                downloads = {
+                    "txt": result["translated_text"].encode("utf-8"),
+                    "docx": save_docx(result["translated_text"])
+                }
+                st.session_state.translation_downloads = downloads
+            
+            # Download options
+            st.subheader("Download Options")
+            col1, col2 = st.columns(2)
+            
+            # Download as TXT
+            with col1:
+                st.download_button(
+                    "Download as TXT",
+                    data=downloads["txt"],
+                    file_name=f"{file_stem}_quebec_french.txt",
+                    mime="text/plain"
+                )
+            
+            # Download as DOCX
+            with col2:
+                st.download_button(
+                    "Download as DOCX",
+                    data=downloads["docx"],
+                    file_name=f"{file_stem}_quebec_french.docx",
+                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                )
+            
+            # Quebec French specific insights
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                with st.expander("Quebec French Terminology Used"):
                     if "document_analysis" in result and result["document_analysis"]:
-                        with st.expander("Document Analysis"):
-                            st.json(result["document_analysis"])
-                    
-                    # Display quality review if available
-                    if "quality_review" in result and result["quality_review"]:
-                        with st.expander("Translation Quality Assessment"):
-                            st.json(result["quality_review"])
-                    
-                    # Cultural adaptation notes
-                    with st.expander("Cultural Adaptation Notes"):
-                        if "quality_review" in result and result["quality_review"] and "cultural_adaptations_assessment" in result["quality_review"]:
-                            st.write(result["quality_review"]["cultural_adaptations_assessment"])
+                        if "quebec_terminology" in result["document_analysis"]:
+                            st.json(result["document_analysis"]["quebec_terminology"])
                         else:
-                            st.write("""
-                            Cultural references have been adapted to be relevant to a Quebec audience. 
-                            This includes considerations for Quebec history, values, and cultural touchpoints.
-                            """)
+                            st.write("No specific Quebec terminology analysis available.")
+                    else:
+                        st.write("No terminology analysis available.")
+            
+            with col2:
+                with st.expander("Quebec French Authenticity Score"):
+                    if "quality_review" in result and result["quality_review"]:
+                        if "quebec_french_authenticity" in result["quality_review"]:
+                            authenticity = result["quality_review"]["quebec_french_authenticity"]
+                            st.metric("Authenticity Score", f"{authenticity}/10")
                             
-                    # Quebec French language tips
-                    st.markdown("""
-                    ### 💡 Quebec French Language Tips
-                    
-                    This translation uses authentic Quebec French expressions and terminology. Some key differences from International French include:
-                    
-                    - Different vocabulary choices unique to Quebec
-                    - Contractions and speech patterns common in Quebec
-                    - Cultural references adapted for Quebec audiences
-                    - Technical terminology using Quebec industry standards
+                            if isinstance(authenticity, (int, float)) or (isinstance(authenticity, str) and authenticity.isdigit()):
+                                auth_score = float(authenticity)
+                                if auth_score >= 8:
+                                    st.success("Excellent Quebec French authenticity!")
+                                elif auth_score >= 6:
+                                    st.info("Good Quebec French authenticity with some room for improvement.")
+                                else:
+                                    st.warning("The translation may need more Quebec French expressions.")
+                        else:
+                            st.write("No authenticity score available.")
+                    else:
+                        st.write("No quality review available.")
+            
+            # Display full document analysis if available
+            if "document_analysis" in result and result["document_analysis"]:
+                with st.expander("Document Analysis"):
+                    st.json(result["document_analysis"])
+            
+            # Display quality review if available
+            if "quality_review" in result and result["quality_review"]:
+                with st.expander("Translation Quality Assessment"):
+                    st.json(result["quality_review"])
+            
+            # Cultural adaptation notes
+            with st.expander("Cultural Adaptation Notes"):
+                if "quality_review" in result and result["quality_review"] and "cultural_adaptations_assessment" in result["quality_review"]:
+                    st.write(result["quality_review"]["cultural_adaptations_assessment"])
+                else:
+                    st.write("""
+                    Cultural references have been adapted to be relevant to a Quebec audience. 
+                    This includes considerations for Quebec history, values, and cultural touchpoints.
                     """)
+                    
+            # Quebec French language tips
+            st.markdown(LANGUAGE_TIPS_MARKDOWN)
 
 if __name__ == "__main__":
     main()
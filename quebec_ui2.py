@@ -1,62 +1,130 @@
 # app.py
 import streamlit as st
 import mammoth
-import os
 import docx
-import tempfile
-import base64
+import hashlib
+import itertools
+import re
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
+from xml.sax.saxutils import escape
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
 from quebec_translation import process_document_for_quebec_french
 
-def extract_text_from_docx(file_path):
-    """Extract text from a .docx file"""
-    with open(file_path, "rb") as docx_file:
-        result = mammoth.extract_raw_text(docx_file)
-        return result.value
+# Words of two or more letters/digits, accents included (underscore excluded from \w)
+_TOKEN_RE = re.compile(r"[^\W_]{2,}")
 
-def extract_text_from_txt(file_path):
-    """Extract text from a .txt file"""
-    with open(file_path, "r", encoding="utf-8") as f:
-        return f.read()
+try:
+    import xxhash
+except ImportError:  # fall back to hashlib's blake2b
+    xxhash = None
 
-def create_download_link(content, filename, link_text):
-    """Generate a download link for text content"""
-    b64 = base64.b64encode(content.encode()).decode()
-    href = f'<a href="data:file/txt;base64,{b64}" download="{filename}">{link_text}</a>'
-    return href
+try:
+    from rapidfuzz import fuzz, utils as fuzz_utils
+except ImportError:  # the fuzzy match score is simply not shown
+    fuzz = None
 
-def save_docx(text, filename):
-    """Save text to a .docx file and create download link"""
-    # Create a docx file
+# DOCX builds and reference extraction run off the script thread so the rest of the page can render meanwhile
+_WORKER_POOL = ThreadPoolExecutor(max_workers=4)
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Text areas show at most this many characters; every rerun resends their full value to the browser
+PREVIEW_CHARS = 20000
+
+def _preview(text):
+    """Truncate long text for on-page display; the downloads carry the full content"""
+    if len(text) <= PREVIEW_CHARS:
+        return text
+    return text[:PREVIEW_CHARS] + "…"
+
+def extract_text_from_docx(file_obj):
+    """Extract text from a .docx file object"""
+    result = mammoth.extract_raw_text(file_obj)
+    return result.value
+
+def extract_text_from_txt(file_bytes):
+    """Extract text from the bytes of a .txt file"""
+    return file_bytes.decode("utf-8")
+
+def content_digest(file_bytes):
+    """Hash upload bytes once so caches can key on the short digest"""
+    if xxhash is not None:
+        return xxhash.xxh3_64(file_bytes).hexdigest()
+    return hashlib.blake2b(file_bytes, digest_size=8).hexdigest()
+
+def extract_text_from_bytes(file_bytes, file_extension):
+    """Extract text from the bytes of an uploaded .docx or .txt file"""
+    # Parse straight from memory; no temp file round-trip
+    if file_extension == "docx":
+        return extract_text_from_docx(BytesIO(file_bytes))
+    return extract_text_from_txt(file_bytes)
+
+@st.cache_data(show_spinner=False)
+def extract_text(digest: str, file_extension: str, _file_bytes: bytes) -> str:
+    """Extract text from an uploaded file (cached per content digest)"""
+    # The underscore keeps Streamlit from re-hashing the bytes; the digest is the cache identity
+    return extract_text_from_bytes(_file_bytes, file_extension)
+
+def start_reference_extraction(file_bytes, file_extension):
+    """Submit the reference extraction, reusing the session's pending or finished one"""
+    key = f"{content_digest(file_bytes)}.{file_extension}"
+    if st.session_state.get("reference_future_key") != key:
+        st.session_state["reference_future"] = _WORKER_POOL.submit(extract_text_from_bytes, file_bytes, file_extension)
+        st.session_state["reference_future_key"] = key
+    return st.session_state["reference_future"]
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def translate_to_quebec_french(text_content: str, params_key: tuple, _progress_cb=None) -> dict:
+    """Run the Quebec French translation pipeline, cached per document text and settings"""
+    # params_key only scopes the cache; the backend does not consume the sidebar parameters yet.
+    # The backend translates paragraph chunks in parallel and reports each one through the callback
+    return process_document_for_quebec_french(text_content, progress_cb=_progress_cb)
+
+def _paragraph_xml(line):
+    """Render one line of text as a WordprocessingML paragraph"""
+    if not line:
+        return "<w:p/>"
+    # Tabs become w:tab elements, as python-docx's add_run does
+    runs = '</w:t><w:tab/><w:t xml:space="preserve">'.join(escape(part) for part in line.split("\t"))
+    return f'<w:p><w:r><w:t xml:space="preserve">{runs}</w:t></w:r></w:p>'
+
+def save_docx(text):
+    """Build a .docx file from text and return its bytes"""
+    # Create a docx file, parsing all paragraphs as one XML fragment instead of one add_paragraph call per line
     doc = docx.Document()
-    for paragraph in text.split('\n'):
-        doc.add_paragraph(paragraph)
+    paragraphs_xml = "".join(_paragraph_xml(line) for line in text.split('\n'))
+    fragment = parse_xml(f'<w:body {nsdecls("w")}>{paragraphs_xml}</w:body>')
+    
+    # Paragraphs go ahead of the trailing section properties
+    body = doc.element.body
+    insert_at = len(body) - 1 if body.sectPr is not None else len(body)
+    body[insert_at:insert_at] = list(fragment)
     
     # Save to BytesIO object
     tmp = BytesIO()
     doc.save(tmp)
-    tmp.seek(0)
-    
-    # Create download link
-    b64 = base64.b64encode(tmp.getvalue()).decode()
-    href = f'<a href="data:application/vnd.openxmlformats-officedocument.wordprocessingml.document;base64,{b64}" download="{filename}">{filename}</a>'
-    return href
+    return tmp.getvalue()
+
+def start_docx_build(text):
+    """Submit the DOCX build for a translation, reusing the session's pending or finished one"""
+    key = content_digest(text.encode("utf-8"))
+    if st.session_state.get("docx_future_key") != key:
+        st.session_state["docx_future"] = _WORKER_POOL.submit(save_docx, text)
+        st.session_state["docx_future_key"] = key
+    return st.session_state["docx_future"]
 
 def calculate_keyword_accuracy(generated_text, reference_text):
     """Calculate keyword overlap between generated and reference translations"""
-    # Convert to lowercase for comparison
-    gen_lower = generated_text.lower()
-    ref_lower = reference_text.lower()
-    
-    # Extract words (simplistic approach - could be improved)
-    gen_words = set([w.strip('.,;:!?()[]{}"\'-') for w in gen_lower.split()])
-    ref_words = set([w.strip('.,;:!?()[]{}"\'-') for w in ref_lower.split()])
+    # Tokenize in one regex pass and lowercase each token, not a full copy of each document
+    gen_words = frozenset(word.lower() for word in _TOKEN_RE.findall(generated_text))
+    ref_words = frozenset(word.lower() for word in _TOKEN_RE.findall(reference_text))
     
     # Calculate overlap
-    common_words = gen_words.intersection(ref_words)
+    common_words = gen_words & ref_words
     
-    # Get important keywords (words longer than 5 chars might be more significant)
-    important_keywords = [word for word in common_words if len(word) > 5]
+    # Get important keywords (words longer than 5 chars might be more significant), stopping at the 20 shown
+    important_keywords = list(itertools.islice((word for word in common_words if len(word) > 5), 20))
     
     # Calculate accuracy
     if len(ref_words) > 0:
@@ -64,12 +132,19 @@ def calculate_keyword_accuracy(generated_text, reference_text):
     else:
         overlap_percentage = 0
         
-    return {
+    results = {
         "overlap_percentage": round(overlap_percentage, 2),
         "common_words": len(common_words),
         "reference_words": len(ref_words),
-        "important_keywords": important_keywords[:20]  # Limit to 20 important keywords
+        "important_keywords": important_keywords
     }
+    
+    # Order-insensitive token match scored in rapidfuzz's C++ core, when installed
+    if fuzz is not None:
+        results["fuzzy_match"] = round(
+            fuzz.token_set_ratio(generated_text, reference_text, processor=fuzz_utils.default_process), 2
+        )
+    return results
 
 def main():
     st.set_page_config(
@@ -149,29 +224,20 @@ def main():
         uploaded_file = st.file_uploader("Upload a document", type=["txt", "docx", "doc"], key="source_doc")
         
         if uploaded_file is not None:
-            # Create a temp file
-            with tempfile.NamedTemporaryFile(delete=False, suffix="." + uploaded_file.name.split(".")[-1]) as tmp:
-                tmp.write(uploaded_file.getvalue())
-                temp_file_path = tmp.name
-            
-            # Extract text based on file type
+            # Extract text based on file type; reruns with the same upload hit the cache
             file_extension = uploaded_file.name.split(".")[-1].lower()
-            if file_extension == "docx":
-                text_content = extract_text_from_docx(temp_file_path)
-            elif file_extension == "txt":
-                text_content = extract_text_from_txt(temp_file_path)
-            else:
+            if file_extension not in ("docx", "txt"):
                 st.error("Unsupported file format. Please upload .txt or .docx files.")
-                os.unlink(temp_file_path)
                 return
-            
-            # Remove temp file
-            os.unlink(temp_file_path)
+            file_bytes = uploaded_file.getvalue()
+            file_digest = content_digest(file_bytes)
+            text_content = extract_text(file_digest, file_extension, file_bytes)
             
             # Display original text
             st.subheader("Original Document")
-            with st.expander("Show Original Content", expanded=True):
-                st.text_area("Original Text", text_content, height=300)
+            # The text area is only sent to the browser while the toggle is on
+            if st.checkbox("Show Original Content", key="show_original"):
+                st.text_area("Original Text", _preview(text_content), height=300)
             
             # Translation section
             st.subheader("Quebec French Translation")
@@ -186,132 +252,136 @@ def main():
             # Start translation button
             if st.button("Translate to Quebec French"):
                 with st.spinner("Translating document to Quebec French..."):
-                    # Progress tracking
+                    # Progress tracking, driven by the pipeline stages and translated chunks as they finish
                     progress_bar = st.progress(0)
+                    stage_text = st.empty()
                     
-                    # Step 1: Document analysis
-                    st.markdown("🔍 Analyzing document structure and content...")
-                    progress_bar.progress(20)
+                    def report_progress(pct, message):
+                        progress_bar.progress(pct)
+                        stage_text.markdown(message)
                     
-                    # Step 2: Quebec French glossary creation
-                    st.markdown("📚 Creating Quebec French terminology glossary...")
-                    progress_bar.progress(35)
+                    # Run the full translation process
+                    result = translate_to_quebec_french(
+                        text_content,
+                        tuple(sorted(custom_parameters.items())),
+                        _progress_cb=report_progress
+                    )
                     
-                    # Step 3: Translation
-                    st.markdown("📝 Translating to Quebec French...")
-                    progress_bar.progress(55)
+                    progress_bar.progress(100)
+                    st.success("Quebec French translation completed!")
+                
+                # Keep the result for reruns (download clicks included), tied to the upload it came from
+                st.session_state['translation_result'] = result
+                st.session_state['translation_source'] = file_digest
+                if "error" not in result:
+                    # Store the translation in session state for validation tab
+                    st.session_state['translated_text'] = result["translated_text"]
+                    st.session_state['original_text'] = text_content
+                    st.session_state['filename'] = uploaded_file.name
+                    st.session_state['translation_txt'] = result["translated_text"].encode("utf-8")
+                    # The DOCX build starts now; its future is kept in session state by start_docx_build
+                    start_docx_build(result["translated_text"])
+            
+            # Results render outside the button branch, so they survive the rerun a download click triggers
+            result = st.session_state.get('translation_result')
+            if result is not None and st.session_state.get('translation_source') == file_digest:
+                if "error" in result:
+                    st.error(f"Error during {result.get('stage', 'translation')}: {result['error']}")
+                else:
+                    # Display translated text
+                    st.text_area("Quebec French Translation", _preview(result["translated_text"]), height=300)
                     
-                    # Step 4: Quebec authenticity check
-                    st.markdown("⚜️ Verifying Quebec French authenticity...")
-                    progress_bar.progress(75)
+                    # Download options
+                    st.subheader("Download Options")
+                    docx_future = start_docx_build(result["translated_text"])
+                    col1, col2 = st.columns(2)
                     
-                    # Step 5: Regional adaptations
-                    st.markdown("🍁 Adding regional Quebec French expressions...")
-                    progress_bar.progress(90)
+                    # Download as TXT, sent as raw bytes instead of a base64 data URI
+                    with col1:
+                        st.download_button(
+                            "Download as TXT",
+                            data=st.session_state['translation_txt'],
+                            file_name=f"{uploaded_file.name.split('.')[0]}_quebec_french.txt",
+                            mime="text/plain"
+                        )
                     
-                    # Run the full translation process
-                    result = process_document_for_quebec_french(text_content)
+                    # Download as DOCX; the button fills in once the background build finishes
+                    with col2:
+                        docx_slot = st.empty()
+                        docx_slot.caption("Preparing DOCX download...")
                     
-                    progress_bar.progress(100)
-                    st.success("Quebec French translation completed!")
+                    # Quebec French specific insights
+                    col1, col2 = st.columns(2)
                     
-                    if "error" in result:
-                        st.error(f"Error during {result.get('stage', 'translation')}: {result['error']}")
-                    else:
-                        # Store the translation in session state for validation tab
-                        st.session_state['translated_text'] = result["translated_text"]
-                        st.session_state['original_text'] = text_content
-                        st.session_state['filename'] = uploaded_file.name
-                        
-                        # Display translated text
-                        st.text_area("Quebec French Translation", result["translated_text"], height=300)
-                        
-                        # Download options
-                        st.subheader("Download Options")
-                        col1, col2 = st.columns(2)
-                        
-                        # Download as TXT
-                        with col1:
-                            txt_download = create_download_link(
-                                result["translated_text"], 
-                                f"{uploaded_file.name.split('.')[0]}_quebec_french.txt",
-                                "Download as TXT"
-                            )
-                            st.markdown(txt_download, unsafe_allow_html=True)
-                        
-                        # Download as DOCX
-                        with col2:
-                            docx_download = save_docx(
-                                result["translated_text"],
-                                f"{uploaded_file.name.split('.')[0]}_quebec_french.docx"
-                            )
-                            st.markdown(docx_download, unsafe_allow_html=True)
-                        
-                        # Quebec French specific insights
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            with st.expander("Quebec French Terminology Used"):
-                                if "document_analysis" in result and result["document_analysis"]:
-                                    if "quebec_terminology" in result["document_analysis"]:
-                                        st.json(result["document_analysis"]["quebec_terminology"])
-                                    else:
-                                        st.write("No specific Quebec terminology analysis available.")
+                    with col1:
+                        with st.expander("Quebec French Terminology Used"):
+                            if "document_analysis" in result and result["document_analysis"]:
+                                if "quebec_terminology" in result["document_analysis"]:
+                                    st.json(result["document_analysis"]["quebec_terminology"])
                                 else:
-                                    st.write("No terminology analysis available.")
-                        
-                        with col2:
-                            with st.expander("Quebec French Authenticity Score"):
-                                if "quality_review" in result and result["quality_review"]:
-                                    if "quebec_french_authenticity" in result["quality_review"]:
-                                        authenticity = result["quality_review"]["quebec_french_authenticity"]
-                                        st.metric("Authenticity Score", f"{authenticity}/10")
-                                        
-                                        if isinstance(authenticity, (int, float)) or (isinstance(authenticity, str) and authenticity.isdigit()):
-                                            auth_score = float(authenticity)
-                                            if auth_score >= 8:
-                                                st.success("Excellent Quebec French authenticity!")
-                                            elif auth_score >= 6:
-                                                st.info("Good Quebec French authenticity with some room for improvement.")
-                                            else:
-                                                st.warning("The translation may need more Quebec French expressions.")
-                                    else:
-                                        st.write("No authenticity score available.")
+                                    st.write("No specific Quebec terminology analysis available.")
+                            else:
+                                st.write("No terminology analysis available.")
+                    
+                    with col2:
+                        with st.expander("Quebec French Authenticity Score"):
+                            if "quality_review" in result and result["quality_review"]:
+                                if "quebec_french_authenticity" in result["quality_review"]:
+                                    authenticity = result["quality_review"]["quebec_french_authenticity"]
+                                    st.metric("Authenticity Score", f"{authenticity}/10")
+                                    
+                                    if isinstance(authenticity, (int, float)) or (isinstance(authenticity, str) and authenticity.isdigit()):
+                                        auth_score = float(authenticity)
+                                        if auth_score >= 8:
+                                            st.success("Excellent Quebec French authenticity!")
+                                        elif auth_score >= 6:
+                                            st.info("Good Quebec French authenticity with some room for improvement.")
+                                        else:
+                                            st.warning("The translation may need more Quebec French expressions.")
                                 else:
-                                    st.write("No quality review available.")
-                        
-                        # Display full document analysis if available
-                        if "document_analysis" in result and result["document_analysis"]:
-                            with st.expander("Document Analysis"):
-                                st.json(result["document_analysis"])
-                        
-                        # Display quality review if available
-                        if "quality_review" in result and result["quality_review"]:
-                            with st.expander("Translation Quality Assessment"):
-                                st.json(result["quality_review"])
-                        
-                        # Cultural adaptation notes
-                        with st.expander("Cultural Adaptation Notes"):
-                            if "quality_review" in result and result["quality_review"] and "cultural_adaptations_assessment" in result["quality_review"]:
-                                st.write(result["quality_review"]["cultural_adaptations_assessment"])
+                                    st.write("No authenticity score available.")
                             else:
-                                st.write("""
-                                Cultural references have been adapted to be relevant to a Quebec audience. 
-                                This includes considerations for Quebec history, values, and cultural touchpoints.
-                                """)
-                                
-                        # Quebec French language tips
-                        st.markdown("""
-                        ### 💡 Quebec French Language Tips
-                        
-                        This translation uses authentic Quebec French expressions and terminology. Some key differences from International French include:
-                        
-                        - Different vocabulary choices unique to Quebec
-                        - Contractions and speech patterns common in Quebec
-                        - Cultural references adapted for Quebec audiences
-                        - Technical terminology using Quebec industry standards
-                        """)
-    
+                                st.write("No quality review available.")
+                    
+                    # Display full document analysis if available
+                    if "document_analysis" in result and result["document_analysis"]:
+                        with st.expander("Document Analysis"):
+                            st.json(result["document_analysis"])
+                    
+                    # Display quality review if available
+                    if "quality_review" in result and result["quality_review"]:
+                        with st.expander("Translation Quality Assessment"):
+                            st.json(result["quality_review"])
+                    
+                    # Cultural adaptation notes
+                    with st.expander("Cultural Adaptation Notes"):
+                        if "quality_review" in result and result["quality_review"] and "cultural_adaptations_assessment" in result["quality_review"]:
+                            st.write(result["quality_review"]["cultural_adaptations_assessment"])
+                        else:
+                            st.write("""
+                            Cultural references have been adapted to be relevant to a Quebec audience. 
+                            This includes considerations for Quebec history, values, and cultural touchpoints.
+                            """)
+                            
+                    # Quebec French language tips
+                    st.markdown("""
+                    ### 💡 Quebec French Language Tips
+                    
+                    This translation uses authentic Quebec French expressions and terminology. Some key differences from International French include:
+                    
+                    - Different vocabulary choices unique to Quebec
+                    - Contractions and speech patterns common in Quebec
+                    - Cultural references adapted for Quebec audiences
+                    - Technical terminology using Quebec industry standards
+                    """)
+                    
+                    docx_slot.download_button(
+                        "Download as DOCX",
+                        data=docx_future.result(),
+                        file_name=f"{uploaded_file.name.split('.')[0]}_quebec_french.docx",
+                        mime=DOCX_MIME
+                    )
+
     with tab2:
         st.subheader("Validate with Reference Quebec French")
         st.info("Upload a reference Quebec French document to compare with the AI translation")
@@ -322,35 +392,24 @@ def main():
             reference_file = st.file_uploader("Upload reference Quebec French document", type=["txt", "docx", "doc"], key="reference_doc")
             
             if reference_file is not None:
-                # Create a temp file
-                with tempfile.NamedTemporaryFile(delete=False, suffix="." + reference_file.name.split(".")[-1]) as tmp:
-                    tmp.write(reference_file.getvalue())
-                    temp_file_path = tmp.name
-                
-                # Extract text based on file type
+                # Extract text in the background while the AI translation column renders
                 file_extension = reference_file.name.split(".")[-1].lower()
-                if file_extension == "docx":
-                    reference_text = extract_text_from_docx(temp_file_path)
-                elif file_extension == "txt":
-                    reference_text = extract_text_from_txt(temp_file_path)
-                else:
+                if file_extension not in ("docx", "txt"):
                     st.error("Unsupported file format. Please upload .txt or .docx files.")
-                    os.unlink(temp_file_path)
                     return
-                
-                # Remove temp file
-                os.unlink(temp_file_path)
+                reference_future = start_reference_extraction(reference_file.getvalue(), file_extension)
                 
                 # Display side by side comparison
                 col1, col2 = st.columns(2)
                 
                 with col1:
                     st.subheader("AI Quebec French Translation")
-                    st.text_area("AI Translation", st.session_state['translated_text'], height=300)
+                    st.text_area("AI Translation", _preview(st.session_state['translated_text']), height=300)
                 
                 with col2:
                     st.subheader("Reference Quebec French")
-                    st.text_area("Reference Translation", reference_text, height=300)
+                    reference_text = reference_future.result()
+                    st.text_area("Reference Translation", _preview(reference_text), height=300)
                 
                 # Calculate accuracy metrics
                 accuracy_results = calculate_keyword_accuracy(
@@ -362,13 +421,16 @@ def main():
                 st.subheader("Translation Accuracy Analysis")
                 
                 # Accuracy score
-                col1, col2, col3 = st.columns(3)
-                with col1:
+                metric_cols = st.columns(4 if "fuzzy_match" in accuracy_results else 3)
+                with metric_cols[0]:
                     st.metric("Keyword Overlap", f"{accuracy_results['overlap_percentage']}%")
-                with col2:
+                with metric_cols[1]:
                     st.metric("Common Words", accuracy_results['common_words'])
-                with col3:
+                with metric_cols[2]:
                     st.metric("Reference Words", accuracy_results['reference_words'])
+                if "fuzzy_match" in accuracy_results:
+                    with metric_cols[3]:
+                        st.metric("Fuzzy Match", f"{accuracy_results['fuzzy_match']}%")
                 
                 # Important keywords found in both
                 st.subheader("Important Matching Keywords")
@@ -381,8 +443,9 @@ def main():
                         end_idx = min((i + 1) * keywords_per_col, len(accuracy_results['important_keywords']))
                         col_keywords = accuracy_results['important_keywords'][start_idx:end_idx]
                         
-                        for keyword in col_keywords:
-                            col.markdown(f"• {keyword}")
+                        # One markdown element per column instead of one per keyword
+                        if col_keywords:
+                            col.markdown("  \n".join(f"• {keyword}" for keyword in col_keywords))
                 else:
                     st.write("No significant matching keywords found")
                 
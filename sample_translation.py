@@ -1,25 +1,33 @@
+import csv
 import json
+import functools
+import hashlib
+import shelve
+import threading
+import time
+import random
 import boto3
-from botocore.exceptions import ClientError
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from botocore.config import Config
+from botocore.exceptions import ClientError, EventStreamError
 import urllib3
-from typing import Dict, Any, Optional, Union, List, Tuple
+from typing import Dict, Any, Iterable, Iterator, Optional, Union, List, Tuple
 import warnings
 import os
 import base64
 import io
-from PIL import Image
-import fitz  # PyMuPDF
-from docx import Document
-from docx.shared import Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-import pandas as pd
-import camelot
-import tabula
+import multiprocessing
+from xml.sax.saxutils import escape
 import re
 from pathlib import Path
 import tempfile
 import logging
 
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib json module
+    orjson = None
+
 # Configure warnings and disable insecure request warnings
 warnings.filterwarnings("ignore", category=UserWarning, message="Unverified HTTPS request")
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -31,8 +39,89 @@ logger = logging.getLogger(__name__)
 # Model configuration
 MODEL_ID = "anthropic.claude-3-5-sonnet-20240620-v1:0"
 
-def initialize_bedrock_client():
-    """Initialize and return AWS Bedrock client with credentials from environment variables"""
+# Client configuration shared by every call; the connection pool is reused across pages, images and tables
+BEDROCK_CONFIG = Config(
+    retries={"max_attempts": 6, "mode": "adaptive"},
+    max_pool_connections=32,
+    tcp_keepalive=True
+)
+
+# Regions to spread calls over (comma-separated); each must have the model enabled. A region that
+# throttles is rested for REGION_COOLDOWN_SECONDS while calls go to the others (us-east-1 if none are set)
+BEDROCK_REGIONS = [region.strip() for region in os.getenv("BEDROCK_REGIONS", "").split(",") if region.strip()] or ["us-east-1"]
+REGION_COOLDOWN_SECONDS = 60
+# Error codes for throttling; a response stream reports it as "throttlingException" mid-stream
+THROTTLING_ERROR_CODES = {"ThrottlingException", "TooManyRequestsException", "throttlingException"}
+
+# Prompt-cache breakpoint for the static system prompt and instruction prefixes
+CACHE_CONTROL = {"type": "ephemeral"}
+# Bedrock prompt caching, by model name: the fewest tokens a cached prefix may hold. Other models reject
+# cache_control, and shorter prefixes are never cached, so blocks are only marked when both allow it
+PROMPT_CACHE_MIN_TOKENS = {
+    "claude-3-5-haiku-20241022-v1:0": 2048,
+    "claude-3-7-sonnet-20250219-v1:0": 1024,
+    "claude-sonnet-4-20250514-v1:0": 1024,
+    "claude-opus-4-20250514-v1:0": 1024,
+}
+
+# Fields that are identical in every Bedrock request
+_BASE_PAYLOAD = {"anthropic_version": "bedrock-2023-05-31"}
+
+# Concurrent Bedrock calls per document; keeps page/image/table fan-out within account rate limits.
+# Throttled calls are retried with backoff by botocore's adaptive mode (see BEDROCK_CONFIG)
+MAX_PARALLEL_REQUESTS = 8
+# Optional cap on Bedrock calls started per minute (e.g. the account's requests-per-minute quota); unset or 0 means no cap
+BEDROCK_REQUESTS_PER_MIN = int(os.getenv("BEDROCK_REQUESTS_PER_MIN", "0") or 0) or None
+
+# Documents shorter than this many pages per worker are extracted in-process; spawning workers costs more
+PARALLEL_EXTRACTION_MIN_PAGES = 8
+
+# Page texts are packed into one call up to this input budget (~4 characters per token); the translated
+# reply runs somewhat longer than its input, so this leaves room under the 4000-token output limit
+MAX_BATCH_INPUT_TOKENS = 1500
+CHARS_PER_TOKEN = 4
+
+# Text-block translations persist here across runs, keyed by whitespace-normalized source text
+TRANSLATION_CACHE_PATH = os.getenv(
+    "PDF_TRANSLATION_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "pdf_translations")
+)
+# Serializes cache access between threads only; dbm files take no cross-process lock, so run a single
+# process per cache file (or give each process its own PDF_TRANSLATION_CACHE)
+_CACHE_LOCK = threading.Lock()
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Embedded image formats that both Claude and python-docx accept as-is; anything else is re-encoded to PNG
+PASSTHROUGH_IMAGE_TYPES = {"jpeg": "image/jpeg", "png": "image/png"}
+
+# Image descriptions share the translation cache under this prefix plus a digest of the image bytes,
+# so a logo or chart repeated on every page is analysed once
+IMAGE_CACHE_PREFIX = "image:"
+IMAGE_ANALYSIS_FAILED = "Image non analysée"
+
+# Claude vision downsamples anything larger, so bigger images only add upload bytes and tokens
+MAX_VISION_EDGE = 1568
+VISION_JPEG_QUALITY = 80
+
+BATCH_TRANSLATION_INSTRUCTIONS = """Translate each value of the JSON object that follows to Canadian French.
+Reply with only a JSON object that has exactly the same keys, each mapped to its translated text."""
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize an object to UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+def _loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON bytes or text, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+@functools.lru_cache(maxsize=None)
+def initialize_bedrock_client(region_name: str = BEDROCK_REGIONS[0]):
+    """Initialize and return AWS Bedrock client with credentials from environment variables (created once per region)"""
     aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID")
     aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY")
     aws_session_token = os.getenv("AWS_SESSION_TOKEN")
@@ -43,30 +132,98 @@ def initialize_bedrock_client():
         aws_session_token=aws_session_token
     )
 
-    bedrock = session.client(service_name='bedrock-runtime', region_name='us-east-1', verify=False)
+    bedrock = session.client(service_name='bedrock-runtime', region_name=region_name, verify=False, config=BEDROCK_CONFIG)
     return bedrock
 
-def invoke_bedrock_claude(
-    prompt: str, 
-    system: Optional[str] = None, 
-    max_tokens: int = 2048, 
-    temperature: float = 0.1,
-    images: Optional[List[str]] = None
-) -> str:
-    """Invoke Claude model through AWS Bedrock with multimodal support"""
-    bedrock = initialize_bedrock_client()
+def _is_throttling(error: ClientError) -> bool:
+    """Check whether a Bedrock error means the region is throttling"""
+    return error.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+
+class MultiRegionBedrock:
+    """Spread Bedrock calls across regional clients, resting regions that throttle"""
+    
+    def __init__(self, regions: List[str]):
+        self.regions = list(regions)
+        self._cold_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def pick_region(self) -> str:
+        """Pick a random region that is not cooling down (any region if all are)"""
+        now = time.monotonic()
+        with self._lock:
+            warm = [region for region in self.regions if self._cold_until.get(region, 0.0) <= now]
+        return random.choice(warm or self.regions)
     
+    def mark_throttled(self, region: str) -> None:
+        """Rest a region after it throttled a call"""
+        with self._lock:
+            self._cold_until[region] = time.monotonic() + REGION_COOLDOWN_SECONDS
+    
+    def invoke(self, operation: str, body: bytes) -> Dict[str, Any]:
+        """Call a bedrock-runtime operation, moving to another region when one throttles"""
+        return self.invoke_with_region(operation, body)[0]
+    
+    def invoke_with_region(self, operation: str, body: bytes) -> Tuple[Dict[str, Any], str]:
+        """Call a bedrock-runtime operation like invoke, also returning the region that answered"""
+        attempts = len(self.regions)
+        for attempt in range(attempts):
+            region = self.pick_region()
+            bedrock = initialize_bedrock_client(region)
+            try:
+                return getattr(bedrock, operation)(
+                    modelId=MODEL_ID,
+                    contentType="application/json",
+                    accept="application/json",
+                    body=body
+                ), region
+            except ClientError as e:
+                if not _is_throttling(e):
+                    raise
+                self.mark_throttled(region)
+                if attempt == attempts - 1:
+                    raise
+                logger.warning(f"Bedrock throttled in {region}; retrying in another region")
+
+_BEDROCK_REGIONS = MultiRegionBedrock(BEDROCK_REGIONS)
+
+def _text_block(text: str, prefix_chars: int) -> Dict[str, Any]:
+    """Return a text content block, marked as a cache breakpoint if the model caches prompts and the prompt
+    up to and including this block (prefix_chars long) is big enough to be cached"""
+    block = {"type": "text", "text": text}
+    min_tokens = PROMPT_CACHE_MIN_TOKENS.get(MODEL_ID.rsplit("anthropic.", 1)[-1])
+    if min_tokens is not None and prefix_chars / CHARS_PER_TOKEN >= min_tokens:
+        block["cache_control"] = CACHE_CONTROL
+    return block
+
+@functools.lru_cache(maxsize=8)
+def _system_blocks(system: str) -> List[Dict[str, Any]]:
+    """Return the system block for a prompt, built once per distinct prompt (treat as read-only)"""
+    return [_text_block(system, len(system))]
+
+def build_request_body(
+    prompt: str, 
+    system: Optional[str], 
+    max_tokens: int, 
+    temperature: float,
+    images: Optional[List[Tuple[str, str]]],
+    cache_prefix: Optional[str]
+) -> bytes:
+    """Build the serialized Anthropic messages payload for a Bedrock invocation"""
     # Prepare content array
     content = []
     
+    # Static instructions go first so they form a cacheable prefix ahead of the per-call content
+    if cache_prefix:
+        content.append(_text_block(cache_prefix, (len(system) if system else 0) + len(cache_prefix)))
+    
     # Add images if provided
     if images:
-        for image_base64 in images:
+        for media_type, image_base64 in images:
             content.append({
                 "type": "image",
                 "source": {
                     "type": "base64",
-                    "media_type": "image/png",
+                    "media_type": media_type,
                     "data": image_base64
                 }
             })
@@ -75,7 +232,7 @@ def invoke_bedrock_claude(
     content.append({"type": "text", "text": prompt})
     
     request_payload = {
-        "anthropic_version": "bedrock-2023-05-31",
+        **_BASE_PAYLOAD,
         "max_tokens": max_tokens,
         "temperature": temperature,
         "messages": [
@@ -87,16 +244,25 @@ def invoke_bedrock_claude(
     }
     
     if system:
-        request_payload["system"] = system
-        
+        request_payload["system"] = _system_blocks(system)
+    
+    return _dumps(request_payload)
+
+def invoke_bedrock_claude(
+    prompt: str, 
+    system: Optional[str] = None, 
+    max_tokens: int = 2048, 
+    temperature: float = 0.1,
+    images: Optional[List[Tuple[str, str]]] = None,
+    cache_prefix: Optional[str] = None
+) -> str:
+    """Invoke Claude model through AWS Bedrock with multimodal support; images are (media_type, base64) pairs"""
     try:
-        response = bedrock.invoke_model(
-            modelId=MODEL_ID,
-            contentType="application/json",
-            accept="application/json",
-            body=json.dumps(request_payload).encode("utf-8")
+        response = _BEDROCK_REGIONS.invoke(
+            "invoke_model",
+            build_request_body(prompt, system, max_tokens, temperature, images, cache_prefix)
         )
-        response_body = json.loads(response["body"].read().decode("utf-8"))
+        response_body = _loads(response["body"].read())
         return response_body["content"][0]["text"]
     except ClientError as e:
         logger.error(f"AWS Error: Cannot invoke '{MODEL_ID}'. Reason: {e}")
@@ -105,8 +271,216 @@ def invoke_bedrock_claude(
         logger.error(f"General Error: {e}")
         raise
 
+def invoke_bedrock_claude_stream(
+    prompt: str, 
+    system: Optional[str] = None, 
+    max_tokens: int = 2048, 
+    temperature: float = 0.1,
+    cache_prefix: Optional[str] = None
+) -> Iterator[str]:
+    """Invoke Claude model through AWS Bedrock, yielding the response text as it is generated"""
+    body = build_request_body(prompt, system, max_tokens, temperature, None, cache_prefix)
+    attempts = len(_BEDROCK_REGIONS.regions)
+    try:
+        for attempt in range(attempts):
+            response, region = _BEDROCK_REGIONS.invoke_with_region("invoke_model_with_response_stream", body)
+            started = False
+            try:
+                for event in response["body"]:
+                    chunk = event.get("chunk")
+                    if chunk is None:
+                        continue
+                    message = _loads(chunk["bytes"])
+                    if message.get("type") == "content_block_delta" and message["delta"].get("type") == "text_delta":
+                        started = True
+                        yield message["delta"]["text"]
+                return
+            except EventStreamError as e:
+                # Throttling inside the stream fails over only before any text was yielded;
+                # once the caller has partial text it propagates like any other error
+                if started or not _is_throttling(e):
+                    raise
+                _BEDROCK_REGIONS.mark_throttled(region)
+                if attempt == attempts - 1:
+                    raise
+                logger.warning(f"Bedrock stream throttled in {region}; retrying in another region")
+    except ClientError as e:
+        logger.error(f"AWS Error: Cannot invoke '{MODEL_ID}'. Reason: {e}")
+        raise
+    except Exception as e:
+        logger.error(f"General Error: {e}")
+        raise
+
+def load_translation_cache(keys: Iterable[str]) -> Dict[str, str]:
+    """Return the persisted translations for the given keys, if any"""
+    try:
+        with _CACHE_LOCK, shelve.open(TRANSLATION_CACHE_PATH, flag="r") as cache:
+            return {key: cache[key] for key in keys if key in cache}
+    except Exception:
+        # Missing or unreadable cache file counts as empty
+        return {}
+
+def store_translation_cache(translations: Dict[str, str]) -> None:
+    """Persist new paragraph translations for later runs"""
+    if not translations:
+        return
+    try:
+        cache_dir = os.path.dirname(TRANSLATION_CACHE_PATH)
+        if cache_dir:  # a bare filename lives in the working directory
+            os.makedirs(cache_dir, exist_ok=True)
+        with _CACHE_LOCK, shelve.open(TRANSLATION_CACHE_PATH) as cache:
+            cache.update(translations)
+    except Exception as e:
+        logger.warning(f"Could not write translation cache: {e}")
+
+def _page_segments(page_info: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Return (cache key, source text) for each text block of a page; only the key is whitespace-normalized"""
+    segments = []
+    for block in page_info['blocks']:
+        text = block.strip()
+        if text:
+            segments.append((WHITESPACE_RE.sub(" ", text), text))
+    return segments
+
+def _is_trivial(text: str) -> bool:
+    """Check whether text has nothing to translate (only whitespace, digits, units or punctuation)"""
+    return not any(char.isalpha() for char in text)
+
+def _paragraph_xml(text: str) -> str:
+    """Render one paragraph of text as WordprocessingML, with line breaks and tabs as add_run makes them"""
+    runs = '</w:t><w:br/><w:t xml:space="preserve">'.join(
+        '</w:t><w:tab/><w:t xml:space="preserve">'.join(escape(part) for part in line.split("\t"))
+        for line in text.split("\n")
+    )
+    return f'<w:p><w:r><w:t xml:space="preserve">{runs}</w:t></w:r></w:p>'
+
+def append_paragraphs(doc, paragraphs: List[str]) -> None:
+    """Append paragraphs to the document body, parsed as one XML fragment instead of one add_paragraph call each"""
+    from docx.oxml import parse_xml
+    from docx.oxml.ns import nsdecls
+    
+    if not paragraphs:
+        return
+    fragment = parse_xml(f'<w:body {nsdecls("w")}>{"".join(_paragraph_xml(para) for para in paragraphs)}</w:body>')
+    
+    # Paragraphs go ahead of the trailing section properties
+    body = doc.element.body
+    insert_at = len(body) - 1 if body.sectPr is not None else len(body)
+    body[insert_at:insert_at] = list(fragment)
+
+def prepare_vision_image(
+    image_data: bytes,
+    media_type: str,
+    size: Optional[Tuple[int, int]] = None
+) -> Tuple[str, str]:
+    """Return (media_type, base64) for Claude vision, downscaling oversized images to a JPEG"""
+    # With the dimensions known from extraction, images that fit are sent as-is without opening them in Pillow
+    if size is not None and max(size) <= MAX_VISION_EDGE:
+        return media_type, base64.b64encode(image_data).decode('ascii')
+    
+    from PIL import Image  # deferred, like the PyMuPDF and python-docx imports below, to keep module import light
+    
+    img = Image.open(io.BytesIO(image_data))
+    if max(img.size) <= MAX_VISION_EDGE:
+        return media_type, base64.b64encode(image_data).decode('ascii')
+    
+    img.thumbnail((MAX_VISION_EDGE, MAX_VISION_EDGE), Image.LANCZOS)
+    buf = io.BytesIO()
+    img.convert("RGB").save(buf, "JPEG", quality=VISION_JPEG_QUALITY, optimize=True)
+    return "image/jpeg", base64.b64encode(buf.getvalue()).decode('ascii')
+
+def extract_page_content(doc, page_num: int) -> Dict[str, Any]:
+    """Extract the text and images of one PDF page"""
+    import fitz  # PyMuPDF
+    
+    page = doc.load_page(page_num)
+    page_content = {
+        'page_number': page_num + 1,
+        'text': '',
+        'images': [],
+        'tables': []
+    }
+    
+    # Extract text as PyMuPDF blocks (type 0 is text), which keep their line breaks and are the units
+    # translated and cached; the page text is their concatenation
+    page_content['blocks'] = [block[4] for block in page.get_text("blocks") if block[6] == 0]
+    page_content['text'] = "".join(page_content['blocks'])
+    
+    # Extract images
+    image_list = page.get_images()
+    for img_index, img in enumerate(image_list):
+        try:
+            xref = img[0]
+            # Keep the embedded stream as-is when it is already JPEG/PNG; decode only other formats
+            raw_image = doc.extract_image(xref)
+            media_type = PASSTHROUGH_IMAGE_TYPES.get(raw_image['ext'])
+            if media_type is not None:
+                img_data = raw_image['image']
+                width, height = raw_image['width'], raw_image['height']
+            else:
+                pix = fitz.Pixmap(doc, xref)
+                if pix.n - pix.alpha >= 4:  # CMYK has no PNG encoding
+                    pix = fitz.Pixmap(fitz.csRGB, pix)
+                img_data = pix.tobytes("png")
+                media_type = "image/png"
+                width, height = pix.width, pix.height
+                pix = None
+            
+            image_info = {
+                'page': page_num + 1,
+                'index': img_index,
+                'data': img_data,
+                'media_type': media_type,
+                'width': width,
+                'height': height,
+                'hash': hashlib.blake2b(img_data, digest_size=16).hexdigest()
+            }
+            page_content['images'].append(image_info)
+        except Exception as e:
+            logger.error(f"Error extracting image {img_index} from page {page_num + 1}: {e}")
+    
+    # Extract ruled tables natively, without a second parse of the whole file
+    try:
+        for table in page.find_tables().tables:
+            dataframe = table.to_pandas()
+            page_content['tables'].append({
+                'page': page_num + 1,
+                'dataframe': dataframe,
+                'csv_string': dataframe.to_csv(index=False)
+            })
+    except Exception as e:
+        logger.warning(f"Table extraction failed on page {page_num + 1}: {e}")
+    
+    return page_content
+
+def _extract_pages(pdf_path: str, page_numbers: List[int]) -> List[Dict[str, Any]]:
+    """Extract a set of pages in a worker process, which opens its own copy of the document"""
+    import fitz  # PyMuPDF
+    
+    with fitz.open(pdf_path) as doc:
+        return [extract_page_content(doc, page_num) for page_num in page_numbers]
+
+class RequestRateLimiter:
+    """Space out request starts so no more than requests_per_min begin in any minute"""
+    
+    def __init__(self, requests_per_min: int):
+        self.interval = 60.0 / requests_per_min
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def acquire(self) -> None:
+        """Block until the caller's request slot arrives"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
 class PDFProcessor:
-    def __init__(self):
+    def __init__(self, max_concurrent_invocations: int = MAX_PARALLEL_REQUESTS, requests_per_min_limit: Optional[int] = BEDROCK_REQUESTS_PER_MIN):
+        self.max_concurrent_invocations = max_concurrent_invocations
+        self._rate_limiter = RequestRateLimiter(requests_per_min_limit) if requests_per_min_limit else None
         self.translation_system_prompt = """You are a professional translator specializing in business and financial documents. 
         Translate the provided content from English to Canadian French while maintaining:
         1. Professional terminology and business language
@@ -116,9 +490,22 @@ class PDFProcessor:
         5. Cultural adaptation for Canadian French context
         
         Provide only the translated text without explanations or metadata."""
+        
+        # Normalized source paragraph -> translation, so repeated headers and boilerplate are sent once;
+        # image descriptions are stored alongside under IMAGE_CACHE_PREFIX keys
+        self._translation_cache: Dict[str, str] = {}
+        # Entries added to the cache during this run; only these are written back to disk
+        self._new_translations: Dict[str, str] = {}
+
+    def _wait_for_request_slot(self) -> None:
+        """Apply the optional requests-per-minute limit before a Bedrock call"""
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
 
     def extract_pdf_content(self, pdf_path: str) -> Dict[str, Any]:
         """Extract all content from PDF including text, images, and tables"""
+        import fitz  # PyMuPDF
+        
         doc = fitz.open(pdf_path)
         content = {
             'pages': [],
@@ -127,123 +514,160 @@ class PDFProcessor:
             'text_blocks': []
         }
         
-        for page_num in range(doc.page_count):
-            page = doc.load_page(page_num)
-            page_content = {
-                'page_number': page_num + 1,
-                'text': '',
-                'images': [],
-                'tables': []
-            }
-            
-            # Extract text
-            text = page.get_text()
-            page_content['text'] = text
-            
-            # Extract images
-            image_list = page.get_images()
-            for img_index, img in enumerate(image_list):
-                try:
-                    xref = img[0]
-                    pix = fitz.Pixmap(doc, xref)
-                    if pix.n - pix.alpha < 4:  # GRAY or RGB
-                        img_data = pix.tobytes("png")
-                        img_base64 = base64.b64encode(img_data).decode()
-                        
-                        image_info = {
-                            'page': page_num + 1,
-                            'index': img_index,
-                            'base64': img_base64,
-                            'width': pix.width,
-                            'height': pix.height
-                        }
-                        page_content['images'].append(image_info)
-                        content['images'].append(image_info)
-                    pix = None
-                except Exception as e:
-                    logger.error(f"Error extracting image {img_index} from page {page_num + 1}: {e}")
-            
-            content['pages'].append(page_content)
-            content['text_blocks'].append(text)
+        # PyMuPDF is not thread-safe, so large documents are split into interleaved page sets across processes;
+        # workers are spawned because forking the multi-threaded Streamlit server is unsafe
+        page_count = doc.page_count
+        workers = min(os.cpu_count() or 1, page_count // PARALLEL_EXTRACTION_MIN_PAGES)
+        if workers > 1:
+            doc.close()
+            page_sets = [list(range(i, page_count, workers)) for i in range(workers)]
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                extracted = [page for pages in pool.map(_extract_pages, [pdf_path] * workers, page_sets) for page in pages]
+            extracted.sort(key=lambda page_content: page_content['page_number'])
+        else:
+            extracted = [extract_page_content(doc, page_num) for page_num in range(page_count)]
+            doc.close()
         
-        # Extract tables using camelot
-        try:
-            tables = camelot.read_pdf(pdf_path, pages='all', flavor='lattice')
-            for i, table in enumerate(tables):
-                table_data = {
-                    'index': i,
-                    'page': table.page,
-                    'dataframe': table.df,
-                    'csv_string': table.df.to_csv(index=False)
-                }
+        for page_content in extracted:
+            content['pages'].append(page_content)
+            content['images'].extend(page_content['images'])
+            content['text_blocks'].append(page_content['text'])
+            for table_data in page_content['tables']:
+                table_data['index'] = len(content['tables'])
                 content['tables'].append(table_data)
-        except Exception as e:
-            logger.warning(f"Camelot table extraction failed: {e}")
-            # Fallback to tabula
-            try:
-                tables = tabula.read_pdf(pdf_path, pages='all', multiple_tables=True)
-                for i, table in enumerate(tables):
-                    table_data = {
-                        'index': i,
-                        'page': i + 1,  # Approximation
-                        'dataframe': table,
-                        'csv_string': table.to_csv(index=False)
-                    }
-                    content['tables'].append(table_data)
-            except Exception as e2:
-                logger.warning(f"Tabula table extraction also failed: {e2}")
         
-        doc.close()
         return content
 
     def translate_text(self, text: str) -> str:
         """Translate text content to Canadian French"""
-        if not text.strip():
+        if _is_trivial(text):
             return text
             
         try:
-            translated = invoke_bedrock_claude(
-                prompt=f"Translate this text to Canadian French:\n\n{text}",
+            self._wait_for_request_slot()
+            translated = "".join(invoke_bedrock_claude_stream(
+                prompt=text,
                 system=self.translation_system_prompt,
-                max_tokens=4000
-            )
+                max_tokens=4000,
+                cache_prefix="Translate this text to Canadian French:"
+            ))
             return translated
         except Exception as e:
             logger.error(f"Translation error: {e}")
             return text  # Return original if translation fails
 
-    def translate_image_content(self, image_base64: str) -> str:
+    def translate_text_batch(self, texts: List[str]) -> List[str]:
+        """Translate several text segments in one call, falling back to per-item calls if the reply cannot be parsed"""
+        # Page numbers, figures and other letter-free segments pass through; the rest are re-interleaved below
+        results = list(texts)
+        pending = [i for i, text in enumerate(texts) if not _is_trivial(text)]
+        for i, translated in zip(pending, self._translate_segments([texts[i] for i in pending])):
+            results[i] = translated
+        return results
+    
+    def _translate_segments(self, texts: List[str]) -> List[str]:
+        """Translate non-trivial segments, packing them into one call when there are several"""
+        if len(texts) <= 1:
+            return [self.translate_text(text) for text in texts]
+        
+        segments = json.dumps({str(i): text for i, text in enumerate(texts)}, ensure_ascii=False)
+        try:
+            self._wait_for_request_slot()
+            reply = "".join(invoke_bedrock_claude_stream(
+                prompt=segments,
+                system=self.translation_system_prompt,
+                max_tokens=4000,
+                cache_prefix=BATCH_TRANSLATION_INSTRUCTIONS
+            ))
+            translated = json.loads(reply[reply.index('{'):reply.rindex('}') + 1])
+            results = [translated[str(i)] for i in range(len(texts))]
+            # A list or object in place of a string would be cached and break the DOCX build later
+            if not all(isinstance(result, str) for result in results):
+                raise ValueError("Batch reply contains a non-string translation")
+            return results
+        except Exception as e:
+            logger.warning(f"Batch translation failed, translating {len(texts)} segments individually: {e}")
+            return [self.translate_text(text) for text in texts]
+    
+    def _batch_texts(self, texts: List[str]) -> List[List[str]]:
+        """Group texts into batches that fit the per-call input budget"""
+        budget = MAX_BATCH_INPUT_TOKENS * CHARS_PER_TOKEN
+        batches = []
+        current = []
+        size = 0
+        for text in texts:
+            if current and size + len(text) > budget:
+                batches.append(current)
+                current = []
+                size = 0
+            current.append(text)
+            size += len(text)
+        if current:
+            batches.append(current)
+        return batches
+    
+    def _resolve_translation(self, key: str, text: str, batch_futures: Dict[str, Tuple[Any, int]]) -> str:
+        """Return the translation of a text block from the cache (by normalized key) or its pending batch"""
+        if key in self._translation_cache:
+            return self._translation_cache[key]
+        if _is_trivial(key):
+            return text
+        batch_future, position = batch_futures[key]
+        translated = batch_future.result()[position]
+        # Failed calls hand back the source text; don't remember those
+        if WHITESPACE_RE.sub(" ", translated).strip() != key:
+            self._translation_cache[key] = translated
+            self._new_translations[key] = translated
+        return translated
+
+    def translate_image_content(
+        self,
+        image_data: bytes,
+        media_type: str = "image/png",
+        size: Optional[Tuple[int, int]] = None
+    ) -> str:
         """Analyze and translate image content using Claude's vision capabilities"""
         try:
             prompt = """Analyze this image and provide a description in Canadian French. 
             If the image contains text, charts, graphs, or diagrams, describe the content and translate any visible text to Canadian French.
             Focus on business/financial content if present."""
             
+            self._wait_for_request_slot()
             description = invoke_bedrock_claude(
                 prompt=prompt,
                 system=self.translation_system_prompt,
-                images=[image_base64],
+                images=[prepare_vision_image(image_data, media_type, size)],
                 max_tokens=1000
             )
             return description
         except Exception as e:
             logger.error(f"Image analysis error: {e}")
-            return "Image non analysée"
+            return IMAGE_ANALYSIS_FAILED
+
+    def _resolve_image_description(self, img_info: Dict[str, Any], image_futures: Dict[str, Any]) -> str:
+        """Return an image description from the cache or its pending analysis"""
+        key = IMAGE_CACHE_PREFIX + img_info['hash']
+        if key in self._translation_cache:
+            return self._translation_cache[key]
+        description = image_futures[key].result()
+        if description != IMAGE_ANALYSIS_FAILED:
+            self._translation_cache[key] = description
+            self._new_translations[key] = description
+        return description
 
     def translate_table(self, table_csv: str) -> str:
         """Translate table content to Canadian French"""
         try:
-            prompt = f"""Translate this CSV table data to Canadian French while preserving the structure:
-
-{table_csv}
-
+            instructions = """Translate the CSV table data that follows to Canadian French while preserving the structure.
 Maintain the CSV format and translate headers and text content appropriately for Canadian French business context."""
             
-            translated_csv = invoke_bedrock_claude(
-                prompt=prompt,
+            self._wait_for_request_slot()
+            translated_csv = "".join(invoke_bedrock_claude_stream(
+                prompt=table_csv,
                 system=self.translation_system_prompt,
-                max_tokens=2000
-            )
+                max_tokens=2000,
+                cache_prefix=instructions
+            ))
             return translated_csv
         except Exception as e:
             logger.error(f"Table translation error: {e}")
@@ -251,79 +675,114 @@ Maintain the CSV format and translate headers and text content appropriately for
 
     def create_translated_docx(self, original_content: Dict[str, Any], output_path: str) -> str:
         """Create a translated DOCX document"""
+        from docx import Document
+        from docx.shared import Inches
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        
         doc = Document()
         
         # Add title
         title = doc.add_heading('Document Traduit - Refuse and Recycling Industry Update', 0)
         title.alignment = WD_ALIGN_PARAGRAPH.CENTER
         
-        # Process each page
-        for page_info in original_content['pages']:
-            page_num = page_info['page_number']
+        # Issue every independent translation call up front; results are consumed in document order below
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_invocations) as pool:
+            # Pages are split into text blocks, and each distinct block (by normalized key) not already cached is
+            # sent once with its line breaks, packed into as few calls as the budget allows; each key keeps (future, position)
+            page_segments = []
+            pending = {}
+            for page_info in original_content['pages']:
+                segments = _page_segments(page_info)
+                page_segments.append(segments)
+                for key, text in segments:
+                    if key not in self._translation_cache and not _is_trivial(key):
+                        pending.setdefault(key, text)
             
-            # Add page header
-            doc.add_heading(f'Page {page_num}', level=1)
+            batch_futures = {}
+            for batch in self._batch_texts(list(pending)):
+                batch_future = pool.submit(self.translate_text_batch, [pending[key] for key in batch])
+                for position, key in enumerate(batch):
+                    batch_futures[key] = (batch_future, position)
+            # Each distinct image (by content hash) not already described is analysed once
+            image_futures = {}
+            for page_info in original_content['pages']:
+                for img_info in page_info['images']:
+                    key = IMAGE_CACHE_PREFIX + img_info['hash']
+                    if key not in self._translation_cache and key not in image_futures:
+                        image_futures[key] = pool.submit(
+                            self.translate_image_content,
+                            img_info['data'],
+                            img_info['media_type'],
+                            (img_info['width'], img_info['height'])
+                        )
+            table_futures = [
+                pool.submit(self.translate_table, table_info['csv_string'])
+                for table_info in original_content['tables']
+            ]
             
-            # Translate and add text content
-            if page_info['text'].strip():
-                translated_text = self.translate_text(page_info['text'])
+            # Process each page
+            for page_info, segments in zip(original_content['pages'], page_segments):
+                page_num = page_info['page_number']
                 
-                # Split into paragraphs and add to document
-                paragraphs = translated_text.split('\n\n')
-                for para in paragraphs:
-                    if para.strip():
-                        doc.add_paragraph(para.strip())
-            
-            # Add images with descriptions
-            for img_info in page_info['images']:
-                try:
-                    # Add image description
-                    img_description = self.translate_image_content(img_info['base64'])
-                    doc.add_paragraph(f"Image Description: {img_description}")
-                    
-                    # Add the actual image
-                    img_data = base64.b64decode(img_info['base64'])
-                    img_stream = io.BytesIO(img_data)
-                    
-                    # Calculate appropriate size (max 6 inches width)
-                    max_width = Inches(6)
-                    aspect_ratio = img_info['height'] / img_info['width']
-                    width = min(max_width, Inches(img_info['width'] / 100))
-                    height = Inches(width.inches * aspect_ratio)
-                    
-                    doc.add_picture(img_stream, width=width)
-                    doc.add_paragraph("")  # Add spacing
-                    
-                except Exception as e:
-                    logger.error(f"Error adding image to document: {e}")
-                    doc.add_paragraph(f"[Image non disponible - Erreur: {str(e)}]")
-        
-        # Add tables section
-        if original_content['tables']:
-            doc.add_heading('Tableaux Traduits', level=1)
-            
-            for table_info in original_content['tables']:
-                try:
-                    translated_csv = self.translate_table(table_info['csv_string'])
-                    
-                    # Parse translated CSV and create table
-                    lines = translated_csv.strip().split('\n')
-                    if lines:
-                        # Create table
-                        table = doc.add_table(rows=len(lines), cols=len(lines[0].split(',')))
-                        table.style = 'Table Grid'
+                # Add page header
+                doc.add_heading(f'Page {page_num}', level=1)
+                
+                # Add translated text content, split into paragraphs and written to the document in one pass
+                paragraphs = [
+                    para.strip()
+                    for key, text in segments
+                    for para in self._resolve_translation(key, text, batch_futures).split('\n\n')
+                    if para.strip()
+                ]
+                append_paragraphs(doc, paragraphs)
+                
+                # Add images with descriptions
+                for img_info in page_info['images']:
+                    try:
+                        # Add image description
+                        img_description = self._resolve_image_description(img_info, image_futures)
+                        doc.add_paragraph(f"Image Description: {img_description}")
                         
-                        for i, line in enumerate(lines):
-                            cells = line.split(',')
-                            for j, cell in enumerate(cells):
-                                if j < len(table.rows[i].cells):
-                                    table.rows[i].cells[j].text = cell.strip('"')
+                        # Add the actual image
+                        img_stream = io.BytesIO(img_info['data'])
                         
+                        # Calculate appropriate size (max 6 inches width)
+                        max_width = Inches(6)
+                        aspect_ratio = img_info['height'] / img_info['width']
+                        width = min(max_width, Inches(img_info['width'] / 100))
+                        height = Inches(width.inches * aspect_ratio)
+                        
+                        doc.add_picture(img_stream, width=width)
                         doc.add_paragraph("")  # Add spacing
                         
-                except Exception as e:
-                    logger.error(f"Error adding table to document: {e}")
-                    doc.add_paragraph(f"[Tableau non disponible - Erreur: {str(e)}]")
+                    except Exception as e:
+                        logger.error(f"Error adding image to document: {e}")
+                        doc.add_paragraph(f"[Image non disponible - Erreur: {str(e)}]")
+            
+            # Add tables section
+            if original_content['tables']:
+                doc.add_heading('Tableaux Traduits', level=1)
+                
+                for table_info, table_future in zip(original_content['tables'], table_futures):
+                    try:
+                        translated_csv = table_future.result()
+                        
+                        # Parse translated CSV (quoted commas and line breaks included) and create table
+                        rows = [row for row in csv.reader(io.StringIO(translated_csv.strip())) if row]
+                        if rows:
+                            # Create table sized to the widest row
+                            table = doc.add_table(rows=len(rows), cols=max(len(row) for row in rows))
+                            table.style = 'Table Grid'
+                            
+                            for table_row, row in zip(table.rows, rows):
+                                for cell, value in zip(table_row.cells, row):
+                                    cell.text = value
+                            
+                            doc.add_paragraph("")  # Add spacing
+                            
+                    except Exception as e:
+                        logger.error(f"Error adding table to document: {e}")
+                        doc.add_paragraph(f"[Tableau non disponible - Erreur: {str(e)}]")
         
         # Save document
         doc.save(output_path)
@@ -341,8 +800,13 @@ Maintain the CSV format and translate headers and text content appropriately for
         pdf_name = Path(pdf_path).stem
         output_path = os.path.join(output_dir, f"{pdf_name}_translated_fr.docx")
         
-        # Create translated document
+        # Create translated document, reusing and extending the on-disk paragraph cache
+        wanted = [key for page_info in content['pages'] for key, _ in _page_segments(page_info)]
+        wanted += [IMAGE_CACHE_PREFIX + img_info['hash'] for page_info in content['pages'] for img_info in page_info['images']]
+        self._translation_cache.update(load_translation_cache(wanted))
         result_path = self.create_translated_docx(content, output_path)
+        store_translation_cache(self._new_translations)
+        self._new_translations = {}
         logger.info(f"Translation completed: {result_path}")
         
         return result_path
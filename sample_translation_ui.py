@@ -1,17 +1,16 @@
 import streamlit as st
+import hashlib
+import importlib.util
 import os
 import tempfile
-import shutil
 from pathlib import Path
 import logging
 import time
-from typing import Optional
+from typing import Optional, Tuple
 import traceback
 
-# Import the backend processor
-try:
-    from pdf_processor_backend import process_pdf_file, PDFProcessor
-except ImportError:
+# Check for the backend processor; it is imported on the first translation so reruns stay light
+if importlib.util.find_spec("pdf_processor_backend") is None:
     st.error("Backend processor not found. Please ensure pdf_processor_backend.py is in the same directory.")
     st.stop()
 
@@ -77,8 +76,10 @@ def initialize_session_state():
     """Initialize session state variables"""
     if 'processing_complete' not in st.session_state:
         st.session_state.processing_complete = False
-    if 'output_file_path' not in st.session_state:
-        st.session_state.output_file_path = None
+    if 'output_file_name' not in st.session_state:
+        st.session_state.output_file_name = None
+    if 'output_file_bytes' not in st.session_state:
+        st.session_state.output_file_bytes = None
     if 'processing_status' not in st.session_state:
         st.session_state.processing_status = "ready"
     if 'error_message' not in st.session_state:
@@ -109,31 +110,39 @@ def display_file_info(uploaded_file):
         for key, value in file_details.items():
             st.write(f"- **{key}:** {value}")
 
-def process_uploaded_file(uploaded_file) -> Optional[str]:
-    """Process the uploaded PDF file"""
+@st.cache_data(show_spinner=False, max_entries=16)
+def translate_pdf(digest: str, file_name: str, _pdf_bytes) -> Tuple[str, bytes]:
+    """Translate a PDF and return the translated document's name and bytes (cached per content digest)"""
+    # The underscore keeps Streamlit from re-hashing the bytes; the digest is the cache identity
+    from pdf_processor_backend import process_pdf_file
+    
+    # Create temporary directories
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Save uploaded file straight from the upload buffer, without a bytes copy
+        input_path = os.path.join(temp_dir, file_name)
+        with open(input_path, "wb") as f:
+            f.write(_pdf_bytes)
+        
+        # Create output directory
+        output_dir = os.path.join(temp_dir, "output")
+        os.makedirs(output_dir, exist_ok=True)
+        
+        # Process the file
+        result_path = process_pdf_file(input_path, output_dir)
+        
+        # Read the result once and keep it in memory; nothing outlives the temporary directory
+        with open(result_path, "rb") as f:
+            return Path(result_path).name, f.read()
+
+def process_uploaded_file(uploaded_file) -> Optional[Tuple[str, bytes]]:
+    """Process the uploaded PDF file and return the translated document's name and bytes"""
     try:
-        # Create temporary directories
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Save uploaded file
-            input_path = os.path.join(temp_dir, uploaded_file.name)
-            with open(input_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
-            
-            # Create output directory
-            output_dir = os.path.join(temp_dir, "output")
-            os.makedirs(output_dir, exist_ok=True)
-            
-            # Process the file
-            st.session_state.processing_status = "processing"
-            result_path = process_pdf_file(input_path, output_dir)
-            
-            # Copy result to a permanent location
-            permanent_dir = "output"
-            os.makedirs(permanent_dir, exist_ok=True)
-            final_path = os.path.join(permanent_dir, Path(result_path).name)
-            shutil.copy2(result_path, final_path)
-            
-            return final_path
+        # Re-uploading an identical PDF reuses the earlier result instead of repeating every Bedrock call
+        pdf_bytes = uploaded_file.getbuffer()
+        digest = hashlib.blake2b(pdf_bytes, digest_size=16).hexdigest()
+        
+        st.session_state.processing_status = "processing"
+        return translate_pdf(digest, uploaded_file.name, pdf_bytes)
             
     except Exception as e:
         logger.error(f"Processing error: {e}")
@@ -222,10 +231,10 @@ def main():
                         
                         # Actually process the file
                         status_text.text("Processing with Claude AI...")
-                        result_path = process_uploaded_file(uploaded_file)
+                        result = process_uploaded_file(uploaded_file)
                         
-                        if result_path and os.path.exists(result_path):
-                            st.session_state.output_file_path = result_path
+                        if result is not None:
+                            st.session_state.output_file_name, st.session_state.output_file_bytes = result
                             st.session_state.processing_complete = True
                             st.session_state.processing_status = "complete"
                             progress_bar.progress(1.0)
@@ -259,31 +268,28 @@ def main():
                 st.error(f"Error: {st.session_state.error_message}")
     
     # Download section
-    if st.session_state.processing_complete and st.session_state.output_file_path:
+    if st.session_state.processing_complete and st.session_state.output_file_bytes is not None:
         st.markdown("---")
         st.markdown("### 📥 Download Translated Document")
         
         col1, col2, col3 = st.columns([1, 2, 1])
         
         with col2:
-            if os.path.exists(st.session_state.output_file_path):
-                with open(st.session_state.output_file_path, "rb") as file:
-                    st.download_button(
-                        label="📄 Download Translated DOCX",
-                        data=file.read(),
-                        file_name=Path(st.session_state.output_file_path).name,
-                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                        type="primary",
-                        use_container_width=True
-                    )
-                
-                st.success("Document ready for download!")
-                
-                # File info
-                file_size = os.path.getsize(st.session_state.output_file_path)
-                st.info(f"File size: {file_size / 1024:.2f} KB")
-            else:
-                st.error("Output file not found. Please try processing again.")
+            # Served from session state, so reruns do not go back to disk
+            st.download_button(
+                label="📄 Download Translated DOCX",
+                data=st.session_state.output_file_bytes,
+                file_name=st.session_state.output_file_name,
+                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                type="primary",
+                use_container_width=True
+            )
+            
+            st.success("Document ready for download!")
+            
+            # File info
+            file_size = len(st.session_state.output_file_bytes)
+            st.info(f"File size: {file_size / 1024:.2f} KB")
     
     # Footer
     st.markdown("---")
@@ -239,9 +239,8 @@ def process_document_for_quebec_french(
 ##################################################3
 # app.py
 import streamlit as st
-import mammoth
+import mmap
 import os
-import docx
 import tempfile
 import base64
 from io import BytesIO
@@ -250,14 +249,25 @@ import json
 
 def extract_text_from_docx(file_path):
     """Extract text from a .docx file"""
+    import mammoth  # deferred so TXT-only sessions never load it
+    
     with open(file_path, "rb") as docx_file:
         result = mammoth.extract_raw_text(docx_file)
         return result.value
 
 def extract_text_from_txt(file_path):
     """Extract text from a .txt file"""
-    with open(file_path, "r", encoding="utf-8") as f:
-        return f.read()
+    # Decode straight from a read-only mapping rather than reading the file into a buffer first
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = str(mm, "utf-8")
+    
+    # Universal newlines, as text-mode open() gave
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
 
 def create_download_link(content, filename, link_text):
     """Generate a download link for text content"""
@@ -267,6 +277,8 @@ def create_download_link(content, filename, link_text):
 
 def save_docx(text, filename):
     """Save text to a .docx file and create download link"""
+    import docx  # deferred: python-docx pulls in lxml
+    
     # Create a docx file
     doc = docx.Document()
     for paragraph in text.split('\n'):
@@ -373,7 +385,7 @@ def main():
         if uploaded_file is not None:
             # Create a temp file
             with tempfile.NamedTemporaryFile(delete=False, suffix="." + uploaded_file.name.split(".")[-1]) as tmp:
-                tmp.write(uploaded_file.getvalue())
+                tmp.write(uploaded_file.getbuffer())
                 temp_file_path = tmp.name
             
             # Extract text based on file type
@@ -486,7 +498,7 @@ def main():
             if reference_file is not None:
                 # Create a temp file
                 with tempfile.NamedTemporaryFile(delete=False, suffix="." + reference_file.name.split(".")[-1]) as tmp:
-                    tmp.write(reference_file.getvalue())
+                    tmp.write(reference_file.getbuffer())
                     temp_file_path = tmp.name
                 
                 # Extract text based on file type
@@ -1,18 +1,24 @@
 import os
 import json
+import math
+import re
 import boto3
 from botocore.exceptions import ClientError
 import urllib3
 from typing import Dict, Any, Optional, Union
 import warnings
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.feature_extraction.text import TfidfVectorizer
-import numpy as np
+from collections import Counter
 
 # Configure warnings and disable insecure request warnings
 warnings.filterwarnings("ignore", category=UserWarning, message="Unverified HTTPS request")
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# TfidfVectorizer's default token pattern: runs of two or more word characters
+_TFIDF_TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+
+# Smoothed idf over two documents: terms in both weigh 1, terms in only one weigh ln(3/2) + 1
+_SINGLE_DOC_IDF = math.log(1.5) + 1
+
 # Model configuration
 MODEL_ID = "anthropic.claude-3-5-sonnet-20240620-v1:0"  # Claude 3.5 Sonnet model ID
 
@@ -304,12 +310,16 @@ def process_document_for_quebec_french(
 
 def calculate_cosine_similarity(text1, text2):
     """Calculate cosine similarity between two texts"""
-    vectorizer = TfidfVectorizer()
-    try:
-        tfidf_matrix = vectorizer.fit_transform([text1, text2])
-        return cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-    except:
+    # Same TF-IDF weighting as sklearn's TfidfVectorizer defaults, from two term counters instead of a fitted matrix
+    counts1 = Counter(_TFIDF_TOKEN_RE.findall(text1.lower()))
+    counts2 = Counter(_TFIDF_TOKEN_RE.findall(text2.lower()))
+    
+    dot = sum(count * counts2[term] for term, count in counts1.items() if term in counts2)
+    if not dot:
         return 0.0
+    norm1 = sum((count if term in counts2 else count * _SINGLE_DOC_IDF) ** 2 for term, count in counts1.items())
+    norm2 = sum((count if term in counts1 else count * _SINGLE_DOC_IDF) ** 2 for term, count in counts2.items())
+    return dot / math.sqrt(norm1 * norm2)
 
 # Main execution block
 if __name__ == "__main__":
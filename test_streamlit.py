@@ -1,23 +1,37 @@
 # app.py
 import streamlit as st
-import mammoth
+import mmap
 import os
-import docx
 import tempfile
 import base64
+import re
 from io import BytesIO
 from quebec_translation import process_document_for_quebec_french, calculate_cosine_similarity
 
+# Words of two or more letters/digits, accents included (underscore excluded from \w)
+_TOKEN_RE = re.compile(r"[^\W_]{2,}")
+
 def extract_text_from_docx(file_path):
     """Extract text from a .docx file"""
+    import mammoth  # deferred so TXT-only sessions never load it
+    
     with open(file_path, "rb") as docx_file:
         result = mammoth.extract_raw_text(docx_file)
         return result.value
 
 def extract_text_from_txt(file_path):
     """Extract text from a .txt file"""
-    with open(file_path, "r", encoding="utf-8") as f:
-        return f.read()
+    # Decode straight from a read-only mapping rather than reading the file into a buffer first
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = str(mm, "utf-8")
+    
+    # Universal newlines, as text-mode open() gave
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
 
 def create_download_link(content, filename, link_text):
     """Generate a download link for text content"""
@@ -27,6 +41,8 @@ def create_download_link(content, filename, link_text):
 
 def save_docx(text, filename):
     """Save text to a .docx file and create download link"""
+    import docx  # deferred: python-docx pulls in lxml
+    
     # Create a docx file
     doc = docx.Document()
     for paragraph in text.split('\n'):
@@ -44,13 +60,9 @@ def save_docx(text, filename):
 
 def calculate_keyword_accuracy(generated_text, reference_text):
     """Calculate keyword overlap between generated and reference translations"""
-    # Convert to lowercase for comparison
-    gen_lower = generated_text.lower()
-    ref_lower = reference_text.lower()
-    
-    # Extract words (simplistic approach - could be improved)
-    gen_words = set([w.strip('.,;:!?()[]{}"\'-') for w in gen_lower.split()])
-    ref_words = set([w.strip('.,;:!?()[]{}"\'-') for w in ref_lower.split()])
+    # Tokenize in one regex pass and lowercase each token, not a full copy of each document
+    gen_words = frozenset(word.lower() for word in _TOKEN_RE.findall(generated_text))
+    ref_words = frozenset(word.lower() for word in _TOKEN_RE.findall(reference_text))
     
     # Calculate overlap
     common_words = gen_words.intersection(ref_words)
@@ -158,7 +170,7 @@ def main():
         if uploaded_file is not None:
             # Create a temp file
             with tempfile.NamedTemporaryFile(delete=False, suffix="." + uploaded_file.name.split(".")[-1]) as tmp:
-                tmp.write(uploaded_file.getvalue())
+                tmp.write(uploaded_file.getbuffer())
                 temp_file_path = tmp.name
             
             # Extract text based on file type
@@ -300,7 +312,7 @@ def main():
             if reference_file is not None:
                 # Create a temp file
                 with tempfile.NamedTemporaryFile(delete=False, suffix="." + reference_file.name.split(".")[-1]) as tmp:
-                    tmp.write(reference_file.getvalue())
+                    tmp.write(reference_file.getbuffer())
                     temp_file_path = tmp.name
                 
                 # Extract text based on file type
@@ -397,7 +409,7 @@ with tab2:
         if reference_file is not None:
             # Create a temp file
             with tempfile.NamedTemporaryFile(delete=False, suffix="." + reference_file.name.split(".")[-1]) as tmp:
-                tmp.write(reference_file.getvalue())
+                tmp.write(reference_file.getbuffer())
                 temp_file_path = tmp.name
             
             # Extract text based on file type